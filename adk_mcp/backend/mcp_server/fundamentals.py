@@ -1,5 +1,8 @@
 from pathlib import Path
 import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 from fastmcp import FastMCP
 
@@ -8,13 +11,31 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
 from utils.crawler.fnguide import FnGuideCrawler
-from utils.yahoofinance import Fundamentals as YahooFundamentals
+from utils.yahoofinance import Fundamentals as YahooFundamentals, dataframe_to_records
+import orjson
 import pandas as pd
-import json
+import pyarrow as pa
 from utils.gcpmanager import GCSManager
 
 mcp = FastMCP(name="StockFundamentalsServer")
 
+gcs_manager = GCSManager()
+
+# 저장한 재무제표는 1시간 동안 CDN/클라이언트 캐시 허용
+FUNDAMENTALS_CACHE_CONTROL = "public, max-age=3600"
+
+# 같은 (소스, 종목, 옵션)으로 동시에 들어온 수집 요청은 진행 중인 작업 하나를 함께 기다림
+_INFLIGHT: dict[tuple, asyncio.Task] = {}
+
+async def _run_coalesced(key: tuple, func, /, **kwargs):
+    """동기 수집 함수를 스레드에서 실행하되, 같은 key의 동시 호출은 한 번만 실행합니다."""
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(asyncio.to_thread(func, **kwargs))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    return await asyncio.shield(task)
+
 @mcp.tool(
     name="find_fnguide_data",
     description="""FnGuide에서 한국 주식 재무제표 수집 (yfinance와 동일한 스키마, 캐시 사용).
@@ -55,7 +76,9 @@ async def fetch_fnguide_data(stock: str, use_cache: bool = True):
         - use_cache=False: 항상 새로 크롤링 (느림, 30초+ 소요)
     """
     crawler = FnGuideCrawler(stock=stock)
-    return await crawler.fundamentals(use_cache=use_cache)
+    return await _run_coalesced(
+        ("fnguide", stock, use_cache), crawler.fundamentals, use_cache=use_cache
+    )
 
 
 @mcp.tool(
@@ -67,14 +90,16 @@ async def fetch_fnguide_data(stock: str, use_cache: bool = True):
     ),
     tags={"finance", "stocks", "fundamentals", "global"}
 )
-def fetch_yahoofinance_data(query: str, attribute: str):
+async def fetch_yahoofinance_data(query: str, attribute: str):
     """
     단일 attribute를 가져오는 함수 (후방 호환성 유지)
     """
-    data = YahooFundamentals().fundamentals(query=query, attribute_name_str=attribute)
+    data = await asyncio.to_thread(
+        YahooFundamentals().fundamentals, query=query, attribute_name_str=attribute
+    )
 
     if isinstance(data, pd.DataFrame):
-        return json.loads(data.to_json(orient="records", date_format="iso"))
+        return dataframe_to_records(data)
     if isinstance(data, pd.Series):
         return data.to_dict()
     if isinstance(data, dict):
@@ -93,7 +118,7 @@ def fetch_yahoofinance_data(query: str, attribute: str):
     """,
     tags={"yahoo", "fundamentals", "global", "cached"}
 )
-def get_yahoofinance_fundamentals(query: str, use_cache: bool = True):
+async def get_yahoofinance_fundamentals(query: str, use_cache: bool = True):
     """
     재무제표 3종(income_stmt, balance_sheet, cashflow)을 한 번에 가져오는 통합 함수
 
@@ -116,41 +141,103 @@ def get_yahoofinance_fundamentals(query: str, use_cache: bool = True):
         }
     """
     # 리팩토링된 Fundamentals 클래스 사용 (캐싱 포함)
-    return YahooFundamentals().fundamentals(query=query, use_cache=use_cache)
+    return await _run_coalesced(
+        ("yahoo", query, use_cache), YahooFundamentals().fundamentals, query=query, use_cache=use_cache
+    )
+
+def _fetch_yahoofinance_fundamentals_batch(queries: list[str], use_cache: bool) -> dict[str, dict]:
+    unique_queries = list(dict.fromkeys(queries))
+    fetcher = YahooFundamentals()
+
+    def _fetch(query: str) -> dict:
+        try:
+            return fetcher.fundamentals(query=query, use_cache=use_cache)
+        except Exception as e:
+            return {"query": query, "error": str(e)}
+
+    # 종목별 요청은 I/O 대기 위주이므로 스레드 풀로 동시에 수행
+    with ThreadPoolExecutor(max_workers=min(8, len(unique_queries))) as executor:
+        return dict(zip(unique_queries, executor.map(_fetch, unique_queries)))
+
+@mcp.tool(
+    name="get_yahoofinance_fundamentals_batch",
+    description="""Yahoo Finance에서 여러 해외 주식의 재무제표를 동시에 수집 (GCS 캐싱 지원).
+    티커가 2개 이상일 때 get_yahoofinance_fundamentals를 반복 호출하는 대신 사용합니다.
+
+    반환: {query: get_yahoofinance_fundamentals 결과} (실패한 종목은 {"query", "error"})
+    """,
+    tags={"yahoo", "fundamentals", "global", "cached", "batch"}
+)
+async def get_yahoofinance_fundamentals_batch(queries: list[str], use_cache: bool = True):
+    """
+    Args:
+        queries: 종목 코드 또는 회사명 목록 (예: ['AAPL', 'MSFT', 'Tesla'])
+        use_cache: GCS 캐시 사용 여부 (기본값: True)
+    """
+    if not queries:
+        return {}
+    return await asyncio.to_thread(_fetch_yahoofinance_fundamentals_batch, queries, use_cache)
+
+# Arrow Table 변환/직렬화 시 타입 문제로 발생하는 오류
+_ARROW_SERIALIZATION_ERRORS = (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError)
+
+def _stringify_records(records: list[dict]) -> list[dict]:
+    """문자열이 아닌 값은 JSON 문자열로 바꿔 모든 컬럼을 문자열(또는 null)로 맞춥니다."""
+    return [
+        {
+            key: value if value is None or isinstance(value, str) else orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            for key, value in record.items()
+        }
+        for record in records
+    ]
 
 @mcp.tool(
     name="save_fundamentals_data_to_gcs",
-    description="Saves fundamentals data to a CSV file in Google Cloud Storage.",
+    description="Saves fundamentals data to a Parquet (default) or CSV file in Google Cloud Storage.",
     tags={"gcs", "fundamentals", "storage"}
 )
-def save_fundamentals_data_to_gcs(fundamentals_data: dict | list, gcs_path: str, file_name: str):
+async def save_fundamentals_data_to_gcs(fundamentals_data: dict | list, gcs_path: str, file_name: str, file_format: str = "parquet"):
     """
     fundamentals_data: The JSON-like object returned from fetch_fnguide_data or fetch_yahoofinance_data.
     gcs_path: The destination folder path in the GCS bucket.
-    file_name: The name of the CSV file.
+    file_name: The name of the file. The extension is replaced to match file_format.
+    file_format: 'parquet' (default) or 'csv'.
     """
     if not fundamentals_data:
         raise ValueError("fundamentals_data cannot be empty.")
 
-    if isinstance(fundamentals_data, list):
-        df = pd.DataFrame(fundamentals_data)
-    elif isinstance(fundamentals_data, dict):
-        df = pd.DataFrame([fundamentals_data])
+    if isinstance(fundamentals_data, dict):
+        records = [fundamentals_data]
+    elif isinstance(fundamentals_data, list):
+        records = fundamentals_data
     else:
         raise TypeError("fundamentals_data must be a dict or a list of dicts.")
-
-    csv_data = df.to_csv(index=False)
-
-    gcs_manager = GCSManager()
-    destination_blob_name = f"{gcs_path}/{file_name}"
-    
-    success = gcs_manager.upload_file(
-        source_file=csv_data,
-        destination_blob_name=destination_blob_name,
-        content_type="text/csv"
-    )
-
-    if success:
-        return f"Successfully saved fundamentals data to gs://{gcs_manager.bucket_name}/{destination_blob_name}"
+    if not all(isinstance(record, dict) for record in records):
+        raise TypeError("Every item in fundamentals_data must be a dict.")
+
+    upload_kwargs = {
+        "destination_blob_name": f"{gcs_path}/{file_name}",
+        "file_format": file_format,
+        "cache_control": FUNDAMENTALS_CACHE_CONTROL,
+        "custom_time": datetime.now(timezone.utc),
+    }
+    try:
+        # 레코드에서 바로 Arrow Table을 만들어 pandas 없이 C++ 작성기로 직렬화
+        table = pa.Table.from_pylist(records)
+        uploaded_blob_name = await asyncio.to_thread(
+            gcs_manager.upload_arrow_table, table, **upload_kwargs
+        )
+    except _ARROW_SERIALIZATION_ERRORS:
+        # 컬럼 타입이 섞였거나 CSV로 쓸 수 없는 중첩 값이 있으면 문자열 값으로 바꿔 저장
+        try:
+            table = pa.Table.from_pylist(_stringify_records(records))
+            uploaded_blob_name = await asyncio.to_thread(
+                gcs_manager.upload_arrow_table, table, **upload_kwargs
+            )
+        except (*_ARROW_SERIALIZATION_ERRORS, orjson.JSONEncodeError) as e:
+            raise TypeError(f"cannot serialize fundamentals_data: {e}") from e
+
+    if uploaded_blob_name:
+        return f"Successfully saved fundamentals data to gs://{gcs_manager.bucket_name}/{uploaded_blob_name}"
     else:
         raise Exception("Failed to upload file to GCS.")
@@ -1,10 +1,11 @@
 from pathlib import Path
 import sys
+import asyncio
 from typing import Any
-from decimal import Decimal
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from fastmcp import FastMCP
 
@@ -13,56 +14,66 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
 from utils.gcpmanager import GCSManager, BQManager
-from utils.yahoofinance import fetch_market_dataframe as fetch_yahoo_market_dataframe
+from utils.yahoofinance import (
+    fetch_market_dataframe as fetch_yahoo_market_dataframe,
+    fetch_market_dataframes as fetch_yahoo_market_dataframes,
+)
 from utils.naverfinance import fetch_market_dataframe as fetch_naver_market_dataframe
 
 mcp = FastMCP(name="GCloudServer")
 
-MARKET_SCHEMA_COLUMNS = [
-    "company_id",
-    "company_name",
-    "exchange",
-    "currency",
-    "date",
-    "open",
-    "high",
-    "low",
-    "close",
-    "adj_close",
-    "volume",
-    "change",
-    "change_percent",
-    "turnover",
-    "market_cap",
-    "sector",
-    "source",
-]
+gcs_manager = GCSManager()
+bq_manager = BQManager()
+
+# stocks_silver.market 테이블 스키마 (NUMERIC은 decimal128(38, 9))
+MARKET_ARROW_SCHEMA = pa.schema([
+    ("company_id", pa.string()),
+    ("company_name", pa.string()),
+    ("exchange", pa.string()),
+    ("currency", pa.string()),
+    ("date", pa.date32()),
+    ("open", pa.decimal128(38, 9)),
+    ("high", pa.decimal128(38, 9)),
+    ("low", pa.decimal128(38, 9)),
+    ("close", pa.decimal128(38, 9)),
+    ("adj_close", pa.decimal128(38, 9)),
+    ("volume", pa.int64()),
+    ("change", pa.decimal128(38, 9)),
+    ("change_percent", pa.float64()),
+    ("turnover", pa.decimal128(38, 9)),
+    ("market_cap", pa.decimal128(38, 9)),
+    ("sector", pa.string()),
+    ("source", pa.string()),
+])
 
 
 def _prepare_market_dataframe(df: pd.DataFrame, metadata: dict[str, Any]) -> pd.DataFrame:
-    prepared_df = df.copy()
+    """
+    원본 시세 DataFrame을 market 테이블 형태로 정리합니다.
+    호출자가 새로 만든 DataFrame을 넘기므로 복사하지 않고 입력을 직접 변경합니다.
+    """
+    prepared_df = df
 
     prepared_df["date"] = pd.to_datetime(prepared_df["date"], errors="coerce")
     prepared_df.dropna(subset=["date"], inplace=True)
 
-    for price_column in ["open", "high", "low", "close"]:
-        if price_column in prepared_df.columns:
-            prepared_df[price_column] = pd.to_numeric(prepared_df[price_column], errors="coerce")
+    if "adj_close" not in prepared_df.columns and "Adj Close" in prepared_df.columns:
+        prepared_df["adj_close"] = prepared_df["Adj Close"]
 
-    if "volume" in prepared_df.columns:
-        prepared_df["volume"] = pd.to_numeric(prepared_df["volume"], errors="coerce")
-    else:
-        prepared_df["volume"] = np.nan
+    # 숫자 컬럼은 컬럼 슬라이스 한 번으로 일괄 변환
+    numeric_columns = [
+        column
+        for column in ("open", "high", "low", "close", "adj_close", "volume")
+        if column in prepared_df.columns
+    ]
+    if numeric_columns:
+        prepared_df[numeric_columns] = prepared_df[numeric_columns].apply(pd.to_numeric, errors="coerce")
 
-    if "adj_close" in prepared_df.columns:
-        prepared_df["adj_close"] = pd.to_numeric(prepared_df["adj_close"], errors="coerce")
-    elif "Adj Close" in prepared_df.columns:
-        prepared_df["adj_close"] = pd.to_numeric(prepared_df["Adj Close"], errors="coerce")
-    else:
+    if "volume" not in prepared_df.columns:
+        prepared_df["volume"] = np.nan
+    if "adj_close" not in prepared_df.columns:
         prepared_df["adj_close"] = prepared_df.get("close")
 
-    prepared_df.sort_values(["date"], inplace=True)
-
     prepared_df["company_id"] = metadata.get("company_id")
     prepared_df["company_name"] = metadata.get("company_name")
     prepared_df["exchange"] = metadata.get("exchange")
@@ -73,22 +84,40 @@ def _prepare_market_dataframe(df: pd.DataFrame, metadata: dict[str, Any]) -> pd.
     if prepared_df["company_id"].isna().all():
         prepared_df["company_id"] = metadata.get("company_name")
 
-    prepared_df.sort_values(["company_id", "date"], inplace=True)
-
-    prepared_df["change"] = prepared_df.groupby("company_id")["close"].diff()
-    prev_close = prepared_df.groupby("company_id")["close"].shift(1)
-    prepared_df["change_percent"] = prepared_df["change"] / prev_close
-    prepared_df.loc[~np.isfinite(prepared_df["change_percent"]), "change_percent"] = np.nan
-    prepared_df["turnover"] = prepared_df["close"] * prepared_df["volume"]
+    # 메타데이터는 스칼라 브로드캐스트이므로 정렬은 여기서 한 번만 수행 (stable)
+    prepared_df.sort_values(["company_id", "date"], inplace=True, kind="mergesort")
 
-    prepared_df["change"] = prepared_df["change"].round(6)
-    prepared_df["change_percent"] = prepared_df["change_percent"].round(6)
-
-    prepared_df["volume"] = prepared_df["volume"].round().astype("Int64")
-    prepared_df["turnover"] = prepared_df["turnover"].round(6)
-    for price_column in ["open", "high", "low", "close", "adj_close"]:
-        if price_column in prepared_df.columns:
-            prepared_df[price_column] = prepared_df[price_column].round(6)
+    close = prepared_df["close"].to_numpy(dtype="float64")
+    if prepared_df["company_id"].nunique(dropna=False) <= 1:
+        # MCP 호출은 대부분 단일 종목이므로 groupby 없이 전일 종가를 바로 계산
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+    else:
+        prev_close = prepared_df.groupby("company_id")["close"].shift(1).to_numpy(dtype="float64")
+    volume = prepared_df["volume"].to_numpy(dtype="float64", na_value=np.nan)
+    change = close - prev_close
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_percent = change / prev_close
+    change_percent[~np.isfinite(change_percent)] = np.nan
+    turnover = close * volume
+
+    # 새로 계산한 배열과 가격 컬럼 블록은 NumPy에서 제자리 반올림 후 한 번에 대입
+    for derived in (change, change_percent, turnover):
+        np.round(derived, 6, out=derived)
+    prepared_df["change"] = change
+    prepared_df["change_percent"] = change_percent
+    prepared_df["turnover"] = turnover
+
+    prepared_df["volume"] = pd.array(np.round(volume), dtype="Int64")
+    price_columns = [
+        column
+        for column in ("open", "high", "low", "close", "adj_close")
+        if column in prepared_df.columns
+    ]
+    price_block = prepared_df[price_columns].to_numpy(dtype="float64", na_value=np.nan)
+    np.round(price_block, 6, out=price_block)
+    prepared_df[price_columns] = price_block
 
     shares_outstanding = metadata.get("shares_outstanding")
     shares_outstanding_value: float | None
@@ -103,48 +132,15 @@ def _prepare_market_dataframe(df: pd.DataFrame, metadata: dict[str, Any]) -> pd.
 
     if "market_cap" in prepared_df.columns:
         prepared_df["market_cap"] = pd.to_numeric(prepared_df["market_cap"], errors="coerce")
-        prepared_df["market_cap"] = prepared_df["market_cap"].round(6)
-
-    prepared_df["date"] = prepared_df["date"].dt.date
-
-    prepared_df = prepared_df.reindex(columns=MARKET_SCHEMA_COLUMNS)
-
-    decimal_scale_map = {
-        "open": 6,
-        "high": 6,
-        "low": 6,
-        "close": 6,
-        "adj_close": 6,
-        "change": 6,
-        "turnover": 6,
-    }
-
-    integer_decimal_columns = {"market_cap"}
-
-    def _to_decimal(value: Any, places: int | None) -> Decimal | None:
-        if value is None:
-            return None
-        if isinstance(value, float) and np.isnan(value):
-            return None
-        if places is None:
-            try:
-                numeric_value = float(value)
-            except (TypeError, ValueError):
-                return None
-            if not np.isfinite(numeric_value):
-                return None
-            return Decimal(str(int(round(numeric_value))))
-        formatted = f"{float(value):.{places}f}"
-        return Decimal(formatted)
-
-    for column, scale in decimal_scale_map.items():
-        if column in prepared_df.columns:
-            prepared_df[column] = prepared_df[column].apply(lambda v: _to_decimal(v, scale))
-
-    for column in integer_decimal_columns:
-        if column in prepared_df.columns:
-            prepared_df[column] = prepared_df[column].apply(lambda v: _to_decimal(v, None))
+        prepared_df["market_cap"] = prepared_df["market_cap"].round()
 
+    # Python date 객체 대신 datetime64를 유지하고 Arrow 변환 시 date32로 캐스팅
+    dates = prepared_df["date"]
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    prepared_df["date"] = dates.dt.normalize()
+
+    # 컬럼 선택과 NUMERIC 변환은 append_rows_arrow에서 MARKET_ARROW_SCHEMA로 한 번에 처리
     prepared_df = prepared_df.dropna(subset=["date"])
 
     return prepared_df
@@ -154,24 +150,22 @@ def _prepare_market_dataframe(df: pd.DataFrame, metadata: dict[str, Any]) -> pd.
     description="Lists files in a specified Google Cloud Storage folder.",
     tags={"gcs", "storage"}
 )
-def list_gcs_files(folder_name: str | None = None):
+async def list_gcs_files(folder_name: str | None = None):
     """
     folder_name: The folder path in the GCS bucket to list files from.
     """
-    gcs_manager = GCSManager()
-    return gcs_manager.list_files(folder_name=folder_name)
+    return await asyncio.to_thread(gcs_manager.list_files, folder_name=folder_name)
 
 @mcp.tool(
     name="read_gcs_file",
     description="Reads a file from Google Cloud Storage.",
     tags={"gcs", "storage"}
 )
-def read_gcs_file(blob_name: str):
+async def read_gcs_file(blob_name: str):
     """
     blob_name: The full path to the file in the GCS bucket.
     """
-    gcs_manager = GCSManager()
-    return gcs_manager.read_file(blob_name=blob_name)
+    return await asyncio.to_thread(gcs_manager.read_file, blob_name=blob_name)
 
 @mcp.tool(
     name="fetch_and_save_market_data_to_bq",
@@ -211,11 +205,11 @@ async def fetch_and_save_market_data_to_bq(site: str, company: str, start_date:
     if df_to_load.empty:
         return "No data found to save."
 
-    bq_manager = BQManager()
-    success = bq_manager.load_dataframe(
+    success = await asyncio.to_thread(
+        bq_manager.append_rows_arrow,
         df=df_to_load,
         table_id="sayouzone-ai.stocks_silver.market",
-        if_exists="append"
+        schema=MARKET_ARROW_SCHEMA,
     )
 
     if success:
@@ -223,6 +217,72 @@ async def fetch_and_save_market_data_to_bq(site: str, company: str, start_date:
     else:
         raise Exception("Failed to load data to BigQuery.")
 
+@mcp.tool(
+    name="fetch_and_save_bulk_market_data_to_bq",
+    description="Fetches Yahoo Finance market data for several stocks in one batched request and saves it to the 'sayouzone-ai.stocks_silver.market' BigQuery table.",
+    tags={"market", "storage", "bigquery", "global"}
+)
+async def fetch_and_save_bulk_market_data_to_bq(companies: list[str], start_date: str, end_date: str):
+    """
+    companies: list of company names or tickers
+    start_date: YYYY-MM-DD
+    end_date: YYYY-MM-DD
+    """
+    market_frames = await fetch_yahoo_market_dataframes(companies, start_date, end_date)
+    if not market_frames:
+        return "No data found to save."
+
+    prepared_frames = []
+    for ticker_symbol, (raw_df, metadata) in market_frames.items():
+        metadata.setdefault("company_id", ticker_symbol)
+        if not metadata.get("company_name"):
+            metadata["company_name"] = metadata["company_id"]
+        prepared_frames.append(_prepare_market_dataframe(raw_df, metadata))
+
+    df_to_load = pd.concat(prepared_frames, ignore_index=True)
+    if df_to_load.empty:
+        return "No data found to save."
+
+    success = await asyncio.to_thread(
+        bq_manager.append_rows_arrow,
+        df=df_to_load,
+        table_id="sayouzone-ai.stocks_silver.market",
+        schema=MARKET_ARROW_SCHEMA,
+    )
+
+    if success:
+        return f"Successfully loaded {len(df_to_load)} rows for {len(market_frames)} companies to sayouzone-ai.stocks_silver.market"
+    else:
+        raise Exception("Failed to load data to BigQuery.")
+
+def _export_query_to_gcs(sql: str, destination_blob_name: str, columns: list[str] | None, file_format: str):
+    # google-adk 등 무거운 의존성을 가진 stock_agent.tools는 첫 호출 시점에 import
+    from stock_agent.tools import execute_bigquery_sql_arrow
+
+    # Arrow IPC 스트림을 그대로 테이블로 읽어 행 단위 dict 변환 없이 업로드
+    table = pa.ipc.open_stream(execute_bigquery_sql_arrow(sql, columns=columns)).read_all()
+    blob_name = gcs_manager.upload_arrow_table(table, destination_blob_name, file_format=file_format)
+    return table.num_rows, blob_name
+
+@mcp.tool(
+    name="export_bq_query_to_gcs",
+    description="Runs a BigQuery SQL query and saves the result to Google Cloud Storage as Parquet or CSV.",
+    tags={"bigquery", "gcs", "storage"}
+)
+async def export_bq_query_to_gcs(sql: str, destination_blob_name: str, columns: list[str] | None = None, file_format: str = "parquet"):
+    """
+    sql: The BigQuery SQL query to run.
+    destination_blob_name: The path of the file to create in the GCS bucket.
+    columns: Optional list of result columns to keep.
+    file_format: 'parquet' (default) or 'csv'.
+    """
+    num_rows, blob_name = await asyncio.to_thread(
+        _export_query_to_gcs, sql, destination_blob_name, columns, file_format
+    )
+    if blob_name is None:
+        raise Exception(f"Failed to upload query result to {destination_blob_name}")
+    return f"Successfully saved {num_rows} rows to {blob_name}"
+
 if __name__ == "__main__":
     mcp.run()
 
@@ -231,7 +291,7 @@ if __name__ == "__main__":
     description="Saves a list of dictionaries to a specified BigQuery table.",
     tags={"bigquery", "storage"}
 )
-def save_data_to_bq(data: list[dict], table_id: str, if_exists: str = "append"):
+async def save_data_to_bq(data: list[dict], table_id: str, if_exists: str = "append"):
     """
     Saves data to a BigQuery table.
 
@@ -244,9 +304,9 @@ def save_data_to_bq(data: list[dict], table_id: str, if_exists: str = "append"):
         return "No data provided to save."
 
     df = pd.DataFrame(data)
-    bq_manager = BQManager()
-    
-    success = bq_manager.load_dataframe(
+
+    success = await asyncio.to_thread(
+        bq_manager.load_dataframe,
         df=df,
         table_id=table_id,
         if_exists=if_exists
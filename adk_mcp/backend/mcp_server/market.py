@@ -16,15 +16,20 @@ from utils.gcpmanager import GCSManager
 
 mcp = FastMCP(name="StockMarketServer")
 
+gcs_manager = GCSManager()
+
+# 사이트별 (서비스 모듈, 종목 식별자 조회 함수) 디스패치 테이블 (모듈 인스턴스는 프로세스 단위로 재사용)
+SITE_HANDLERS = {
+    "naver": (NaverMarket(), find.get_code),
+    "yahoo": (YahooMarket(), find.get_ticker),
+}
+
 async def _get_market_data(site, company, start_date=None, end_date=None, fn="collect"):
-    if site.lower() == "naver":
-        service_module = NaverMarket()
-        ticker = find.get_code(company) or company
-    elif site.lower() == "yahoo":
-        service_module = YahooMarket()
-        ticker = find.get_ticker(company) or company
-    else:
+    site_handler = SITE_HANDLERS.get(site.lower())
+    if site_handler is None:
         raise ValueError(f"Site {site} not found.")
+    service_module, resolve_identifier = site_handler
+    ticker = resolve_identifier(company) or company
 
     if not ticker:
         raise ValueError(f"Stock {company} not found.")
@@ -77,14 +82,15 @@ async def process_market_data(site: str, company: str):
 
 @mcp.tool(
     name="save_market_data_to_gcs",
-    description="Saves market data to a CSV file in Google Cloud Storage.",
+    description="Saves market data to a Parquet (default) or CSV file in Google Cloud Storage.",
     tags={"gcs", "market", "storage"}
 )
-def save_market_data_to_gcs(market_data: dict, gcs_path: str, file_name: str):
+async def save_market_data_to_gcs(market_data: dict, gcs_path: str, file_name: str, file_format: str = "parquet"):
     """
     market_data: The JSON-like object returned from collect_market_data or process_market_data.
     gcs_path: The destination folder path in the GCS bucket.
-    file_name: The name of the CSV file.
+    file_name: The name of the file. The extension is replaced to match file_format.
+    file_format: 'parquet' (default) or 'csv'.
     """
     if not market_data:
         raise ValueError("market_data cannot be empty.")
@@ -94,19 +100,16 @@ def save_market_data_to_gcs(market_data: dict, gcs_path: str, file_name: str):
         raise ValueError("market_data does not contain 'priceHistory'.")
 
     df = pd.DataFrame(price_history)
-    csv_data = df.to_csv(index=False)
-
-    gcs_manager = GCSManager()
-    destination_blob_name = f"{gcs_path}/{file_name}"
-    
-    success = gcs_manager.upload_file(
-        source_file=csv_data,
-        destination_blob_name=destination_blob_name,
-        content_type="text/csv"
+
+    uploaded_blob_name = await asyncio.to_thread(
+        gcs_manager.upload_dataframe,
+        df,
+        destination_blob_name=f"{gcs_path}/{file_name}",
+        file_format=file_format,
     )
 
-    if success:
-        return f"Successfully saved market data to gs://{gcs_manager.bucket_name}/{destination_blob_name}"
+    if uploaded_blob_name:
+        return f"Successfully saved market data to gs://{gcs_manager.bucket_name}/{uploaded_blob_name}"
     else:
         raise Exception("Failed to upload file to GCS.")
 
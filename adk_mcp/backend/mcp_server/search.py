@@ -1,7 +1,11 @@
 from pathlib import Path
+import asyncio
+import os
 import sys
 from typing import Dict, List, Optional
 
+import orjson
+from cachetools import TTLCache
 from fastmcp import FastMCP
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -16,6 +20,17 @@ from utils.websearchtool import (
 
 mcp = FastMCP(name="SearchServer")
 
+# 반복되는 hybrid 검색 결과는 직렬화된 바이트로 보관 (Brave/Exa 호출과 인코딩을 모두 생략)
+_HYBRID_CACHE: TTLCache = TTLCache(
+    maxsize=512, ttl=int(os.getenv("SEARCH_CACHE_TTL", "600"))
+)
+# 같은 키로 동시에 들어온 캐시 미스는 진행 중인 검색 하나를 함께 기다림
+_INFLIGHT: dict[tuple, asyncio.Task] = {}
+
+
+def _domains_key(domains: Optional[List[str]]):
+    return tuple(sorted({domain.strip().lower() for domain in domains})) if domains else None
+
 
 @mcp.tool(
     name="brave_search",
@@ -95,26 +110,52 @@ async def hybrid_web_search(
     end_published: Optional[str] = None,
 ) -> Dict:
     """Fuse Brave and Exa search results and optionally enrich the top URLs."""
-    return await hybrid_web_search_async(
-        query=query,
-        top_k=top_k,
-        brave_kinds=brave_kinds,
-        brave_each_k=brave_each_k,
-        exa_k=exa_k,
-        exa_type=exa_type,
-        fuse_w_brave=fuse_w_brave,
-        fuse_w_exa=fuse_w_exa,
-        enrich_with_exa_contents=enrich_with_exa_contents,
-        enrich_limit=enrich_limit,
-        lang=lang,
-        country=country,
-        safesearch=safesearch,
-        include_domains=include_domains,
-        exclude_domains=exclude_domains,
-        category=category,
-        start_published=start_published,
-        end_published=end_published,
+    normalized_query = " ".join(query.split()).lower()
+    cache_key = (
+        normalized_query, top_k, tuple(brave_kinds) if brave_kinds else None, brave_each_k,
+        exa_k, exa_type, fuse_w_brave, fuse_w_exa, enrich_with_exa_contents, enrich_limit,
+        lang, country, safesearch, _domains_key(include_domains), _domains_key(exclude_domains),
+        category, start_published, end_published,
     )
+    cached = _HYBRID_CACHE.get(cache_key)
+    if cached is not None:
+        # 호출 측이 결과를 수정해도 캐시가 오염되지 않도록 매번 새 dict로 복원
+        return orjson.loads(cached)
+
+    task = _INFLIGHT.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_run_hybrid_search(
+            cache_key,
+            query=query,
+            top_k=top_k,
+            brave_kinds=brave_kinds,
+            brave_each_k=brave_each_k,
+            exa_k=exa_k,
+            exa_type=exa_type,
+            fuse_w_brave=fuse_w_brave,
+            fuse_w_exa=fuse_w_exa,
+            enrich_with_exa_contents=enrich_with_exa_contents,
+            enrich_limit=enrich_limit,
+            lang=lang,
+            country=country,
+            safesearch=safesearch,
+            include_domains=include_domains,
+            exclude_domains=exclude_domains,
+            category=category,
+            start_published=start_published,
+            end_published=end_published,
+        ))
+        _INFLIGHT[cache_key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(cache_key, None))
+    # 함께 기다린 호출들도 각자 새 dict를 받도록 직렬화된 결과에서 복원
+    return orjson.loads(await asyncio.shield(task))
+
+
+async def _run_hybrid_search(cache_key: tuple, **kwargs) -> bytes:
+    result = await hybrid_web_search_async(**kwargs)
+    encoded = orjson.dumps(result, default=str)
+    _HYBRID_CACHE[cache_key] = encoded
+    return encoded
 
 
 if __name__ == "__main__":
@@ -1,25 +1,98 @@
+import asyncio
+import logging
+import os
+import threading
+
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter
+from fastapi.responses import Response
+from google.api_core.exceptions import NotFound
 from utils.gcpmanager import GCSManager
 from google.cloud import storage
 
 gcs_manager = GCSManager()
+
+# 요청마다 인증(ADC)/커넥션 풀을 새로 만들지 않도록 프로세스 단위로 재사용
+try:
+    _STORAGE_CLIENT = storage.Client(project="sayouzone-ai")
+    _BUCKET = _STORAGE_CLIENT.bucket("sayouzone-ai-stocks")
+except Exception as e:
+    logging.warning("GCS client 초기화 실패 (펀더멘털 캐시 비활성화): %s", e)
+    _STORAGE_CLIENT = None
+    _BUCKET = None
+
+# 같은 종목의 반복 요청은 GCS GET 없이 프로세스 메모리에서 응답 (크기/TTL 제한)
+_PAYLOAD_CACHE: TTLCache = TTLCache(
+    maxsize=1024, ttl=int(os.getenv("FUNDAMENTALS_CACHE_TTL", "300"))
+)
+_PAYLOAD_LOCK = threading.Lock()
+
+# 같은 종목에 대해 동시에 들어온 요청은 진행 중인 에이전트 실행 하나를 함께 기다림
+_INFLIGHT: dict[str, asyncio.Task] = {}
+# 진행 중인 백그라운드 캐시 업로드 (태스크가 GC되지 않도록 참조 유지)
+_BACKGROUND_UPLOADS: set[asyncio.Task] = set()
+
+# google-adk 등 무거운 의존성을 가진 에이전트 모듈은 첫 요청 시점에 한 번만 import
+_agent_module = None
+
+def _get_agent_module():
+    global _agent_module
+    if _agent_module is None:
+        from stock_agent.fundamentals_agent import agent
+        _agent_module = agent
+    return _agent_module
+
+# 캐시 blob 경로 템플릿 (요청마다 경로 문자열을 새로 조합하지 않도록 미리 바인딩)
+_cache_blob_name = "Fundamentals/{}.json".format
+
 # --- API 라우터 정의 ---
 router = APIRouter(prefix="/fundamentals")
 # --- 헬퍼 함수 ---
-def _check_cache(stock):
-    client = storage.Client(project="sayouzone-ai")
-    bucket = client.bucket(bucket_name="sayouzone-ai-stocks")
-    blob = bucket.blob("Fundamentals/{stock}.json")
-
-    content_bytes = blob.download_as_bytes()
-    return content_bytes
-
-def _save_to_cache(stock, data):
-    client = storage.Client(project="sayouzone-ai")
-    bucket = client.bucket(bucket_name="sayouzone-ai-stocks")
-    blob = bucket.blob(f"Fundamentals/{stock}.json")
-    blob.upload_from_string(data)
-    
+def _download_cache(stock) -> bytes | None:
+    if _BUCKET is None:
+        return None
+    blob = _BUCKET.blob(_cache_blob_name(stock))
+
+    try:
+        return blob.download_as_bytes()
+    except NotFound:
+        return None
+
+def _upload_cache(stock, data):
+    if _BUCKET is None:
+        return
+    blob = _BUCKET.blob(_cache_blob_name(stock))
+    blob.upload_from_string(data, content_type="application/json")
+
+def _remember_payload(stock, data: bytes) -> None:
+    with _PAYLOAD_LOCK:
+        _PAYLOAD_CACHE[stock] = data
+
+# 동기 GCS 호출이 이벤트 루프(다른 요청)를 막지 않도록 스레드에서 실행
+async def _check_cache(stock):
+    with _PAYLOAD_LOCK:
+        hit = _PAYLOAD_CACHE.get(stock)
+    if hit is not None:
+        return hit
+
+    content = await asyncio.to_thread(_download_cache, stock)
+    if content:
+        _remember_payload(stock, content)
+    return content
+
+def _save_to_cache(stock, data: bytes) -> None:
+    # 메모리 캐시는 즉시 갱신하고, GCS 업로드는 응답을 기다리게 하지 않도록 백그라운드에서 실행
+    _remember_payload(stock, data)
+    task = asyncio.create_task(asyncio.to_thread(_upload_cache, stock, data))
+    _BACKGROUND_UPLOADS.add(task)
+    task.add_done_callback(_finish_background_upload)
+
+def _finish_background_upload(task: asyncio.Task) -> None:
+    _BACKGROUND_UPLOADS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logging.warning("펀더멘털 캐시 GCS 업로드 실패: %s", task.exception())
+
 @router.get("/{stock}", summary="티커 기반 재무제표 조회")
 async def get_fundamentals(stock: str, nocache: bool = False):
     """
@@ -27,15 +100,31 @@ async def get_fundamentals(stock: str, nocache: bool = False):
     2. 캐시 없으면 Agent 호출하여 데이터 수집
     3. Agent가 MCP tool 자동 선택 (티커 형식 기반)
     """
-    
-    # 1. 캐시 조회
-    if not nocache:
+
+    # 1. 캐시 조회 (저장된 응답 JSON을 그대로 반환)
+    if nocache:
+        with _PAYLOAD_LOCK:
+            _PAYLOAD_CACHE.pop(stock, None)
+    else:
         cached_data = await _check_cache(stock)
         if cached_data:
-            return cached_data
+            return Response(content=cached_data, media_type="application/json")
+
+    task = _INFLIGHT.get(stock)
+    if task is None:
+        task = asyncio.create_task(_collect_fundamentals(stock))
+        _INFLIGHT[stock] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(stock, None))
+    # 한 요청이 취소되어도 다른 대기 요청을 위한 에이전트 실행은 계속되도록 shield
+    payload = await asyncio.shield(task)
+    return Response(content=payload, media_type="application/json")
 
-    from stock_agent.fundamentals_agent.agent import call_agent_async
-    agent_result = await call_agent_async(user_input_ticker=stock)
+async def _collect_fundamentals(stock):
+    agent_result = await _get_agent_module().call_agent_async(user_input_ticker=stock)
 
-    await _save_to_cache(stock, agent_result)
-    return {"result": agent_result}
\ No newline at end of file
+    # 캐시에 저장할 바이트를 그대로 응답 본문으로도 사용 (직렬화 1회)
+    payload = orjson.dumps(
+        {"result": agent_result}, default=str, option=orjson.OPT_NON_STR_KEYS
+    )
+    _save_to_cache(stock, payload)
+    return payload
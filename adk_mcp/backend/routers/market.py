@@ -10,8 +10,18 @@ import asyncio
 from typing import Any, Dict, Callable, AsyncIterable, TypedDict, cast
 
 # --- Numpy 타입 JSON 인코더 ---
+# 자주 나오는 numpy 타입은 type() 기준 O(1) 조회로 변환 (isinstance 사슬은 조회 실패 시에만)
+_NP_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    **{t: int for t in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64)},
+    **{t: float for t in (np.float16, np.float32, np.float64)},
+    np.ndarray: np.ndarray.tolist,
+}
+
 class NpEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
+        converter = _NP_CONVERTERS.get(type(o))
+        if converter is not None:
+            return converter(o)
         if isinstance(o, np.integer):
             return int(o)
         if isinstance(o, np.floating):
@@ -25,6 +35,19 @@ SERVICE_MAP = {
     "naver": naverfinance.Market(),
     "yahoo": yahoofinance.Market(),
 }
+# 사이트별 종목 식별자 조회 함수 (yahoo: 티커, 그 외: 종목 코드)
+IDENTIFIER_RESOLVERS = {
+    "naver": find.get_code,
+    "yahoo": find.get_ticker,
+}
+# AI 분석 결과가 없을 때 내려주는 기본 분석 JSON (요청마다 직렬화하지 않도록 미리 생성)
+NO_ANALYSIS_JSON = json.dumps({
+    "summary": "AI 분석 결과가 없습니다.",
+    "key_issues": "-",
+    "risk_factors": "-",
+    "investment_implication": "분석 오류"
+}, ensure_ascii=False)
+
 class ErrorResult(TypedDict):
     error: str
 
@@ -40,11 +63,12 @@ def _validate_and_get_params(fn_raw: str, site: str, stock: str, start_date: dat
     if fn not in ("collect", "process"):
         return {"error": "function must be collect or process"}
 
-    service_module = SERVICE_MAP.get(site.lower())
+    site_key = site.lower()
+    service_module = SERVICE_MAP.get(site_key)
     if not service_module:
         return {"error": f"Site {site} not found."}
 
-    ticker = find.get_ticker(stock) if site.lower() == 'yahoo' else find.get_code(stock)
+    ticker = IDENTIFIER_RESOLVERS.get(site_key, find.get_code)(stock)
     if not ticker:
         return {"error": f"Stock {stock} not found."}
 
@@ -82,17 +106,15 @@ async def _perform_analysis_and_format_response(market_data, fn):
         }
         analysis_input = json.dumps(summary_for_analysis, cls=NpEncoder, ensure_ascii=False, indent=2)
         prompt = get_market_prompt()
-        analysis_result_str = gemini.analysis(data_json=analysis_input, prompt=prompt)
+        # Gemini 호출은 동기 네트워크 I/O이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        analysis_result_str = await asyncio.to_thread(gemini.analysis, data_json=analysis_input, prompt=prompt)
         if analysis_result_str is None:
-            analysis_result_str = json.dumps({
-                "summary": "AI 분석 결과가 없습니다.",
-                "key_issues": "-",
-                "risk_factors": "-",
-                "investment_implication": "분석 오류"
-            }, ensure_ascii=False)
-        analysis_result_obj = json.loads(analysis_result_str)
-        final_payload = {"type": "final", "result": market_data, "analysis": analysis_result_obj}
-        yield f"data: {json.dumps(final_payload, cls=NpEncoder, ensure_ascii=False)}\n\n"
+            analysis_result_str = NO_ANALYSIS_JSON
+        # gemini.analysis는 검증된 JSON 문자열만 반환하므로 다시 파싱/인코딩하지 않고 그대로 삽입
+        # (JSON 문자열 내부 줄바꿈은 이스케이프되어 있으므로, 남은 줄바꿈은 SSE 프레임을 위해 공백으로 치환)
+        analysis_json = analysis_result_str.replace("\r", " ").replace("\n", " ")
+        result_json = json.dumps(market_data, cls=NpEncoder, ensure_ascii=False)
+        yield f'data: {{"type": "final", "result": {result_json}, "analysis": {analysis_json}}}\n\n'
 
 # --- API 라우터 정의 ---
 router = APIRouter(prefix="/market")
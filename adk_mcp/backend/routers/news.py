@@ -10,6 +10,14 @@ SERVICE_MAP = {
     "yahoofinance": yahoofinance.News(),
 }
 
+# 조회 기간(일)별 최대 기사 수 (그 외 기간은 DEFAULT_MAX_ARTICLES)
+MAX_ARTICLES_BY_PERIOD = {
+    "0": 50,
+    "1": 30,
+    "7": 100,
+}
+DEFAULT_MAX_ARTICLES = 200
+
 router = APIRouter(prefix="/news")
 
 @router.get("/{function}/{site}/{stock}", summary="뉴스 수집/처리 (collect/process)")
@@ -20,14 +28,7 @@ async def news_collect_or_process(function: str, site: str, stock: str, period:
             yield f"data: {json.dumps({'error': 'function must be collect or process'})}\n\n"
             return
 
-        if period == "0":
-            max_articles = 50
-        elif period == "1":
-            max_articles = 30
-        elif period == "7":
-            max_articles = 100
-        else:
-            max_articles = 200
+        max_articles = MAX_ARTICLES_BY_PERIOD.get(period, DEFAULT_MAX_ARTICLES)
 
         service_module = SERVICE_MAP.get(site.lower())
         if not service_module:
@@ -66,7 +67,8 @@ async def news_collect_or_process(function: str, site: str, stock: str, period:
 
                 analysis_input = json.dumps(articles, ensure_ascii=False, indent=2)
                 prompt = get_news_prompt()
-                analysis_result_str = gemini.analysis(data_json=analysis_input, prompt=prompt)
+                # Gemini 호출은 동기 네트워크 I/O이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+                analysis_result_str = await asyncio.to_thread(gemini.analysis, data_json=analysis_input, prompt=prompt)
                 final_payload = {"type": "final", "result": articles, "analysis": analysis_result_str}
                 yield f"data: {json.dumps(final_payload)}\n\n"
 
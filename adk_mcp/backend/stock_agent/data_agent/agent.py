@@ -61,8 +61,9 @@ You have tools to:
 1.  Fetch market data (`collect_market_data`).
 2.  Fetch fundamental data (`find_fnguide_data`, `find_yahoofinance_data`).
 3.  Save data to Google Cloud Storage (`save_market_data_to_gcs`, `save_fundamentals_data_to_gcs`).
-4.  Save data to BigQuery (`fetch_and_save_market_data_to_bq`, `save_data_to_bq`).
+4.  Save data to BigQuery (`fetch_and_save_market_data_to_bq`, `fetch_and_save_bulk_market_data_to_bq` for several Yahoo tickers at once, `save_data_to_bq`).
 5.  List and read files from GCS (`list_gcs_files`, `read_gcs_file`).
+6.  Export a BigQuery query result to GCS as Parquet or CSV (`export_bq_query_to_gcs`).
 
 **IMPORTANT**: You must chain tools together. For example, to fulfill a request like "save the market data for AAPL to a file", you must first call `collect_market_data` and then use the output of that tool as the input for `save_market_data_to_gcs`.
 
@@ -1,5 +1,8 @@
+import asyncio
 import os
+from functools import lru_cache
 import json
+import orjson
 from datetime import date, datetime, timezone
 
 import logging
@@ -26,7 +29,7 @@ _backend_dir = Path(__file__).resolve().parent.parent.parent
 if str(_backend_dir) not in sys.path:
     sys.path.insert(0, str(_backend_dir))
 
-from tools import fundamentals_mcp_tool
+from tools import classify_ticker, close_mcp_toolsets, fundamentals_mcp_tool, warmup_mcp_toolsets
 from fundamentals_agent.prompt import fetch_fundamentals_prompt, fetch_fundamentals_prompt_from_string
 from google.adk.tools.set_model_response_tool import SetModelResponseTool
 from utils.gcpmanager import GCSManager
@@ -46,7 +49,7 @@ fundamentals_fetcher_instruction = f"{CURRENT_DATE_LINE_KO}\n\n{fetch_fundamenta
 FLASH_MODEL = "gemini-2.5-flash"
 PRO_MODEL = "gemini-2.5-pro"
 
-_FETCHER_TOOLS: List[Any] = [fundamentals_mcp_tool]
+_FETCHER_TOOLS: List[Any] = [fundamentals_mcp_tool, classify_ticker]
 
 # --- 상수 정의 ---
 APP_NAME = "fundamentals_analysis_app"
@@ -61,27 +64,32 @@ logger = logging.getLogger(__name__)
 def _strip_none(data: dict[str, Any]) -> dict[str, Any]:
     return {key: value for key, value in data.items() if value is not None}
 
+# 세션 스냅샷 업로드 대상 버킷 (시작 시 한 번만 확인)
+_GCS_BUCKET = os.getenv("GOOGLE_CLOUD_STORAGE_BUCKET")
+
+@lru_cache(maxsize=1)
+def _get_gcs_manager() -> GCSManager:
+    # 호출마다 storage.Client(인증/HTTP 세션)를 새로 만들지 않도록 프로세스 단위로 재사용
+    return GCSManager(bucket_name=_GCS_BUCKET) if _GCS_BUCKET else GCSManager()
+
+# 세션 상태에는 numpy 값이나 문자열이 아닌 키가 섞일 수 있으므로 orjson 옵션으로 허용
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
 # 추후 Cloud Storage -> BigQuery 로 수정, 함수 이름 변경
 def _upload_gcs_json_payload(
     gcs_manager: GCSManager,
     *,
     blob_name: str,
-    payload: dict[str, Any],
+    serialized: bytes,
 ) -> bool:
     """
-    주어진 페이로드를 JSON으로 변환해 Google Cloud Storage에 업로드합니다.
+    JSON으로 직렬화된 페이로드를 Google Cloud Storage에 업로드합니다.
     
     Args:
         gcs_manager: GCSManager 인스턴스.
         blob_name: 업로드될 파일의 블롭 이름(예: "Fundamentals/005930.json").
-        payload: 업로드할 JSON 데이터 (dict).
+        serialized: 업로드할 JSON 바이트 (UTF-8).
     """
-    try:
-        serialized = json.dumps(payload, ensure_ascii=False, default=str)
-    except Exception as exc:  # pragma: no cover - defensive logging
-        logger.error("Failed to serialize payload for %s: %s", blob_name, exc)
-        return False
-
     return gcs_manager.upload_file(
         source_file=serialized,
         destination_blob_name=blob_name,
@@ -90,30 +98,53 @@ def _upload_gcs_json_payload(
     )
 
 # 추후 Cloud Storage -> BigQuery 로 수정
-def _upload_to_destinations(
+async def _upload_to_destinations(
     gcs_manager: GCSManager,
     *,
-    payload: dict[str, Any],
+    payload: dict[str, Any] | bytes,
     base_filename: str,
     destinations: List[str],
 ) -> None:
     """
-    주어진 페이로드를 여러 목적지 경로에 업로드합니다.
+    주어진 페이로드를 여러 목적지 경로에 동시에 업로드합니다.
+    페이로드는 한 번만 직렬화하고, 동기 GCS 업로드는 스레드에서 병렬로 실행합니다.
     
     Args:
         gcs_manager: GCSManager 인스턴스.
-        payload: 업로드할 JSON 데이터 (dict).
+        payload: 업로드할 JSON 데이터 (dict) 또는 이미 직렬화된 JSON 바이트.
         base_filename: 업로드될 파일의 기본 이름 (예: "005930.json").
         destinations: 업로드할 경로(prefix)의 리스트. 빈 문자열("")은 버킷 루트를 의미합니다.
     """
-    for prefix in destinations:
-        # prefix가 있으면 경로를 조합하고, 없으면(버킷 루트) 파일 이름만 사용합니다.
-        blob_name = f"{prefix}/{base_filename}" if prefix else base_filename
-        
-        # 경로 맨 앞에 있을 수 있는 슬래시 제거
-        blob_name = blob_name.lstrip('/')
+    if isinstance(payload, bytes):
+        serialized = payload
+    else:
+        try:
+            serialized = orjson.dumps(payload, default=str, option=_ORJSON_OPTIONS)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.error("Failed to serialize payload for %s: %s", base_filename, exc)
+            return
+
+    # prefix가 있으면 경로를 조합하고, 없으면(버킷 루트) 파일 이름만 사용합니다.
+    # 경로 맨 앞에 있을 수 있는 슬래시 제거
+    blob_names = [
+        (f"{prefix}/{base_filename}" if prefix else base_filename).lstrip('/')
+        for prefix in destinations
+    ]
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(_upload_gcs_json_payload, gcs_manager, blob_name=blob_name, serialized=serialized)
+            for blob_name in blob_names
+        )
+    )
 
-        _upload_gcs_json_payload(gcs_manager, blob_name=blob_name, payload=payload)
+# 재무제표 3종 키와 누락 시 채울 기본 메시지 (호출마다 새로 만들지 않도록 모듈 상수로 유지)
+_STATEMENT_KEYS = ("balance_sheet", "income_statement", "cash_flow")
+_MISSING_STATEMENT_MESSAGE = "데이터가 제공되지 않았습니다."
+# 누락 필드 기본값 (ticker를 제외한 폴백 페이로드와 동일)
+_MISSING_PAYLOAD_DEFAULTS = {
+    "country": "Unknown",
+    **dict.fromkeys(_STATEMENT_KEYS, _MISSING_STATEMENT_MESSAGE),
+}
 
 def _fallback_fundamentals_payload(ticker: str, message: str) -> dict[str, str]:
     """
@@ -126,9 +157,7 @@ def _fallback_fundamentals_payload(ticker: str, message: str) -> dict[str, str]:
     return {
         "ticker": ticker or "",
         "country": "Unknown",
-        "balance_sheet": fallback_message,
-        "income_statement": fallback_message,
-        "cash_flow": fallback_message,
+        **dict.fromkeys(_STATEMENT_KEYS, fallback_message),
     }
 
 def _normalize_fundamentals_payload(value: Any, *, ticker: str) -> dict[str, Any]:
@@ -154,10 +183,14 @@ def _normalize_fundamentals_payload(value: Any, *, ticker: str) -> dict[str, Any
             clean_value = clean_value[:-3]
         
         try:
-            parsed = json.loads(clean_value)
-        except json.JSONDecodeError:
-            # 파싱 실패 시 원본 문자열로 폴백 데이터를 생성한다.
-            return _fallback_fundamentals_payload(ticker, value)
+            parsed = orjson.loads(clean_value)
+        except orjson.JSONDecodeError:
+            # orjson이 거부하는 NaN/Infinity 리터럴 등은 표준 json으로 한 번 더 시도
+            try:
+                parsed = json.loads(clean_value)
+            except json.JSONDecodeError:
+                # 파싱 실패 시 원본 문자열로 폴백 데이터를 생성한다.
+                return _fallback_fundamentals_payload(ticker, value)
         
         if not isinstance(parsed, dict):
             return _fallback_fundamentals_payload(ticker, str(parsed))
@@ -172,10 +205,7 @@ def _normalize_fundamentals_payload(value: Any, *, ticker: str) -> dict[str, Any
     merged["ticker"] = ticker or str(merged.get("ticker", ""))
     merged.setdefault("country", "Unknown")
 
-    defaults = _fallback_fundamentals_payload(merged["ticker"], "데이터가 제공되지 않았습니다.")
-    for key, fallback in defaults.items():
-        if key == "ticker":
-            continue
+    for key, fallback in _MISSING_PAYLOAD_DEFAULTS.items():
         if not merged.get(key):
             merged[key] = fallback
         elif not isinstance(merged[key], str):
@@ -501,10 +531,19 @@ fundamentals_analysis_agent = FundamentalsAnalysisAgent(
 # FastMCP 및 ADK 로더가 찾을 수 있도록 루트 에이전트 별칭을 노출
 root_agent = fundamentals_analysis_agent
 
+async def warmup_fetcher_tools():
+    """펀더멘털 수집용 MCP 서버를 첫 요청 전에 미리 연결합니다."""
+    await warmup_mcp_toolsets([fundamentals_mcp_tool])
+
+async def close_fetcher_tools():
+    """서버 종료 시 펀더멘털 수집용 MCP 서버 연결과 자식 프로세스를 정리합니다."""
+    await close_mcp_toolsets([fundamentals_mcp_tool])
+
 async def setup_session_and_runner(ticker: str):
     # ADK 세션, 러너 설정을 위한 함수
     session_service = InMemorySessionService()
-    initial_state = {"ticker": ticker}
+    # 종목 분류는 규칙 기반으로 미리 계산하여 LLM이 형식을 추론하지 않도록 함
+    initial_state = {"ticker": ticker, "market": classify_ticker(ticker)}
     session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID, state=initial_state)
     logger.info(f"Initial session state: {session.state}")
     runner = Runner(
@@ -527,7 +566,8 @@ async def call_agent_async(user_input_ticker: str):
     session_service, runner = await setup_session_and_runner(ticker=user_input_ticker)
 
     # ADK event
-    content = types.Content(role='user', parts=[types.Part(text=f"Analysis a stock about: {user_input_ticker}")])
+    market = classify_ticker(user_input_ticker)
+    content = types.Content(role='user', parts=[types.Part(text=f"Analysis a stock about: {user_input_ticker} (market: {market})")])
     events = runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content)
 
     final_response = "No final response captured."
@@ -550,7 +590,6 @@ async def call_agent_async(user_input_ticker: str):
                                                 user_id=USER_ID, 
                                                 session_id=SESSION_ID)
     print("Final Session State:")
-    import json
     session_state = final_session.state if final_session else {}
     if isinstance(session_state, dict):
         final_state = dict(session_state)
@@ -566,22 +605,24 @@ async def call_agent_async(user_input_ticker: str):
     # Upload full session snapshot (partitioned and legacy path retained for compatibility)
     has_error = bool(final_state.get("agent_run_error"))
 
-    gcs_bucket_name = os.getenv("GOOGLE_CLOUD_STORAGE_BUCKET")
-    gcs_manager = GCSManager(bucket_name=gcs_bucket_name) if gcs_bucket_name else GCSManager()
+    gcs_manager = _get_gcs_manager()
 
     now = datetime.now(timezone.utc)
     AGENT_STATE_CACHE_PREFIX = "Fundamentals/cache/agent_state"
     partition_prefix = f"{AGENT_STATE_CACHE_PREFIX}/year={now.year}/quarter={(now.month - 1)//3 + 1}"
 
+    # 세션 상태는 한 번만 직렬화하여 GCS 스냅샷 업로드와 반환값에 함께 사용
+    final_state_json = orjson.dumps(final_state, default=str, option=_ORJSON_OPTIONS)
+
     # --- ▼▼▼ 기존 업로드 로직을 아래 코드로 대체합니다 ▼▼▼ ---
 
     if not has_error:
         # 1. 전체 세션 스냅샷 업로드 (파티션 경로 & 레거시 경로)
         state_filename = f"{user_input_ticker}.json"
         state_destinations = [partition_prefix, AGENT_STATE_CACHE_PREFIX]
-        _upload_to_destinations(
+        state_upload = _upload_to_destinations(
             gcs_manager,
-            payload=final_state,
+            payload=final_state_json,
             base_filename=state_filename,
             destinations=state_destinations
         )
@@ -600,14 +641,17 @@ async def call_agent_async(user_input_ticker: str):
         )
         # 버킷 루트는 빈 문자열("")로 표현
         analysis_destinations = ["", partition_prefix]
-        _upload_to_destinations(
+        analysis_upload = _upload_to_destinations(
             gcs_manager,
             payload=analysis_payload,
             base_filename=analysis_filename,
             destinations=analysis_destinations
         )
 
-    final_result = json.dumps(final_state, indent=2, ensure_ascii=False, default=str)
+        # 세션 스냅샷과 분석 페이로드는 서로 독립적이므로 업로드를 동시에 진행
+        await asyncio.gather(state_upload, analysis_upload)
+
+    final_result = final_state_json.decode("utf-8")
     print(final_result)
     print("-------------------------------\n")
     return final_response, final_result
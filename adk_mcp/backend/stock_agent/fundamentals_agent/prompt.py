@@ -1,11 +1,15 @@
+from functools import lru_cache
 from pathlib import Path
 from prompts import fundamentals
 
+@lru_cache(maxsize=1)
 def fetch_fundamentals_prompt() -> str:
     """
     Navigate to project root and find prompt file
     Current file: backend/stock_agent/fundamentals_agent/prompt.py
     Target file: prompt/fetch_fundamentals.md (from project root)
+
+    The file is static, so it is read once on first use and cached.
     """
     project_root = Path(__file__).resolve().parent.parent.parent.parent
     fetch_fundamentals_prompt_path = project_root / "prompt" / "fetch_fundamentals.md"
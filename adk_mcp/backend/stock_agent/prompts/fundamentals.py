@@ -15,7 +15,10 @@ For a given ticker, collect and store the following financial statements in the
 ## Workflow
 
 ### Step 1: Ticker Classification
-Analyze the input `ticker` format to determine the appropriate data source.
+If the request already states the market (e.g. `(market: KR)` or `(market: US)`), use it directly:
+`KR` → `find_fnguide_data`, `US` → `get_yahoofinance_fundamentals`.
+Otherwise call `classify_ticker(ticker="...")` once; it returns `KR`, `US`, or `UNKNOWN`.
+Only fall back to the patterns below when the result is `UNKNOWN`.
 
 #### Korean Stock Patterns
 - 6-digit numbers: `005930`, `000660`, `035720`
@@ -41,8 +44,13 @@ find_fnguide_data(stock="삼성전자")
 # International stocks example
 get_yahoofinance_fundamentals(query="AAPL")
 get_yahoofinance_fundamentals(query="Apple")
+
+# Several international tickers in one request
+get_yahoofinance_fundamentals_batch(queries=["AAPL", "MSFT", "TSLA"])
 ```
 
+If the input contains more than one international ticker, call `get_yahoofinance_fundamentals_batch` once with all of them instead of calling `get_yahoofinance_fundamentals` per ticker.
+
 ### Step 3: Data Validation & Mapping
 Standardize the collected data keys.
 
@@ -138,12 +146,23 @@ Input: "999999" (non-existent ticker)
 **Parameters**: `query: str` (e.g., "AAPL", "Apple")
 **Returns**: dict with keys `ticker`, `country`, `balance_sheet`, `income_statement`, `cash_flow`
 
-### 3. save_fundamentals_data_to_gcs
+### 3. get_yahoofinance_fundamentals_batch
+**Purpose**: Fetch financials for several international stocks concurrently
+**Parameters**: `queries: list[str]` (e.g., ["AAPL", "MSFT"])
+**Returns**: dict keyed by query, each value shaped like `get_yahoofinance_fundamentals` (or `{"query", "error"}` on failure)
+
+### 4. classify_ticker
+**Purpose**: Deterministically classify a ticker/company name as Korean or international
+**Parameters**: `ticker: str` (e.g., "005930", "삼성전자", "AAPL")
+**Returns**: `"KR"`, `"US"`, or `"UNKNOWN"`
+
+### 5. save_fundamentals_data_to_gcs
 **Purpose**: Save collected data to Google Cloud Storage
 **Parameters**:
 - `fundamentals_data: dict`
 - `gcs_path: str`
 - `file_name: str`
+- `file_format: str` (`"parquet"` (default) or `"csv"`; the file extension follows it)
 
 ---
 
@@ -1,99 +1,344 @@
+import asyncio
 from google.cloud import bigquery
-import json
 import os
 import logging
+import orjson
 import pathlib
-from typing import Any, Optional, List
+import re
+import threading
+from concurrent.futures import Future
+import sys
+import time
+from typing import Any, Literal, Optional, List
+
+import pyarrow as pa
+from cachetools import TTLCache
+from google.api_core import exceptions as api_exceptions
+from google.api_core import retry as api_retry
 
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import (
     StdioConnectionParams,
     StdioServerParameters,
+    StreamableHTTPConnectionParams,
 )
 
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from utils.companydict import companydict as find
+
 GOOGLE_CLOUD_PROJECT = "sayouzone-ai"
 logger = logging.getLogger(__name__)
 
+# 인증/커넥션 풀을 재사용하도록 BigQuery 클라이언트는 프로세스당 한 번만 생성
+_bq_client: Optional[bigquery.Client] = None
+_bq_client_lock = threading.Lock()
+
+
+def _get_bq_client() -> bigquery.Client:
+    global _bq_client
+    if _bq_client is None:
+        with _bq_client_lock:
+            if _bq_client is None:
+                _bq_client = bigquery.Client(project=GOOGLE_CLOUD_PROJECT)
+    return _bq_client
+
+# BigQuery 측 결과 캐시를 명시적으로 사용 (동일 SQL은 메타데이터 조회만으로 응답)
+_QUERY_JOB_CONFIG = bigquery.QueryJobConfig(use_query_cache=True)
+
+# 같은 대화 안에서 반복되는 분석 쿼리는 짧은 TTL 동안 결과를 재사용 (key: 정리된 SQL)
+SQL_RESULT_CACHE_TTL_SECONDS = 300
+_sql_result_cache: TTLCache = TTLCache(maxsize=256, ttl=SQL_RESULT_CACHE_TTL_SECONDS)
+_sql_result_cache_lock = threading.RLock()
+
+# 단일 문자 처리(줄바꿈 → 공백, 백슬래시 삭제)는 str.translate 한 번으로 수행
+_SQL_CHAR_TRANSLATION = str.maketrans({"\n": " ", "\\": None})
+
+
 def clean_sql_query(text):
-    return (
-        text.replace("\\n", " ")
-        .replace("\n", " ")
-        .replace("\\", "")
-        .replace("```sql", "")
-        .replace("```", "")
-        .strip()
-    )
+    # 이스케이프된 줄바꿈("\\n")은 백슬래시를 지우기 전에 공백으로 바꿔야 함
+    if "\\n" in text:
+        text = text.replace("\\n", " ")
+    text = text.translate(_SQL_CHAR_TRANSLATION)
+    if "```" in text:
+        text = text.replace("```sql", "").replace("```", "")
+    return text.strip()
 
-def execute_bigquery_sql(sql: str) -> str:
-    """Executes a BigQuery SQL query and returns the result as a JSON string."""
-    print(f"Executing BigQuery SQL query: {sql}")
-    cleaned_sql = clean_sql_query(sql)
-    print(f"Cleaned SQL query: {cleaned_sql}")
-    try:
-        # The client uses the GOOGLE_CLOUD_PROJECT environment variable.
-        client = bigquery.Client(project=GOOGLE_CLOUD_PROJECT)
-        query_job = client.query(cleaned_sql)  # Make an API request.
-        results = query_job.result()  # Wait for the job to complete.
+# 한국: 6자리 코드(+.KS/.KQ) 또는 한글 포함 이름 / 해외: 1-5자 알파벳 티커 (BRK.B 같은 클래스 표기 허용)
+_KR_TICKER_RE = re.compile(r"^\d{6}(?:\.K[SQ])?$|[\uac00-\ud7a3]", re.IGNORECASE)
+_US_TICKER_RE = re.compile(r"^[A-Z]{1,5}(?:[.-][A-Z])?$", re.IGNORECASE)
+_TICKER_SPLIT_RE = re.compile(r"[\s,]+")
+
+
+def _classify_token(token: str) -> Literal["KR", "US", "UNKNOWN"]:
+    resolved = find.get_ticker(token)
+    if resolved:
+        token = resolved
+    if _KR_TICKER_RE.search(token):
+        return "KR"
+    if _US_TICKER_RE.match(token):
+        return "US"
+    return "UNKNOWN"
+
+
+def classify_ticker(ticker: str) -> Literal["KR", "US", "UNKNOWN"]:
+    """
+    종목 코드/이름을 한국(KR, FnGuide) 또는 해외(US, Yahoo Finance) 종목으로 분류합니다.
+    여러 종목이 섞여 있어 하나로 정할 수 없으면 UNKNOWN을 반환합니다.
+    """
+    text = (ticker or "").strip()
+    if not text:
+        return "UNKNOWN"
+    if find.get_ticker(text) or not _TICKER_SPLIT_RE.search(text):
+        return _classify_token(text)
+    classes = {_classify_token(token) for token in _TICKER_SPLIT_RE.split(text) if token}
+    return classes.pop() if len(classes) == 1 else "UNKNOWN"
+
+
+# 일시적 오류(429/5xx 등)는 클라이언트 라이브러리에서 지수 백오프로 재시도
+_QUERY_RETRY = api_retry.Retry(
+    predicate=api_retry.if_transient_error,
+    initial=1.0,
+    maximum=10.0,
+    timeout=20.0,
+)
+
+
+class _CircuitBreaker:
+    """
+    연속 실패가 fail_max회 이상이면 reset_timeout 동안 호출을 바로 거절합니다.
+    reset_timeout이 지나면 half-open 상태에서 시험 호출 하나만 허용하고,
+    그 결과가 기록될 때까지 나머지 호출은 계속 거절합니다.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._half_open and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # half-open: 시험 호출 한 번만 허용 (결과 기록 전까지 나머지는 거절)
+                self._half_open = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._half_open or self._failures >= self.fail_max:
+                # 시험 호출이 실패하면 다시 reset_timeout 동안 차단
+                self._opened_at = time.monotonic()
+                self._half_open = False
+
+
+_bq_breaker = _CircuitBreaker()
+
+# 실행 중인 동일 쿼리 (key: 정리된 SQL, max_results)
+_inflight_queries: dict[tuple, Future] = {}
+_inflight_queries_lock = threading.Lock()
+
+# Storage Read API를 쓸 수 없어 REST 페이지로 받을 때 왕복 횟수를 줄이기 위한 페이지 크기
+QUERY_RESULT_PAGE_SIZE = 10_000
 
-        # Convert RowIterator to a list of dictionaries
-        sql_results = [dict(row) for row in results]
+def _query_to_arrow(cleaned_sql: str, max_results: Optional[int] = None) -> pa.Table:
+    client = _get_bq_client()
+    query_job = client.query(cleaned_sql, job_config=_QUERY_JOB_CONFIG, retry=_QUERY_RETRY)  # Make an API request.
+    # Storage Read API(gRPC 스트리밍)로 결과를 Arrow 테이블로 받아 Row 객체 생성을 생략
+    rows = query_job.result(page_size=QUERY_RESULT_PAGE_SIZE, max_results=max_results)
+    return rows.to_arrow(create_bqstorage_client=True)
+
+def execute_bigquery_sql_arrow(sql: str, columns: Optional[List[str]] = None) -> bytes:
+    """
+    BigQuery SQL 결과를 Arrow IPC 스트림(bytes)으로 반환합니다.
+    JSON 변환 없이 컬럼 단위로 처리하는 경로(gcloud MCP 서버의 export_bq_query_to_gcs)에서 사용하며,
+    columns를 주면 해당 컬럼만 남깁니다.
+    """
+    logger.debug("Executing BigQuery SQL query (arrow): %s", sql)
+    table = _query_to_arrow(clean_sql_query(sql))
+    if columns:
+        table = table.select(columns)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def _run_bigquery_sql(cleaned_sql: str, max_results: Optional[int], cache_key: tuple) -> str:
+    if not _bq_breaker.allow():
+        return "Error executing BigQuery query: BigQuery is temporarily unavailable after repeated failures. Try again later."
+    try:
+        results = _query_to_arrow(cleaned_sql, max_results=max_results)
+        _bq_breaker.record_success()
 
         # Return the results as a JSON string.
-        if not sql_results:
-            return "Query returned no results."
+        if results.num_rows == 0:
+            sql_result = "Query returned no results."
         else:
-            # Use json.dumps for proper JSON formatting, handle non-serializable
-            # types like datetime
-            return (
-                json.dumps(sql_results, default=str)
-                .replace("```sql", "")
-                .replace("```", "")
-            )
+            # orjson은 datetime/date를 C 레벨에서 직접 직렬화하고,
+            # Decimal 등 나머지 타입만 default=str로 처리
+            sql_result = orjson.dumps(
+                results.to_pylist(),
+                default=str,
+                option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+            ).decode("utf-8")
+        # 오류 응답은 캐시하지 않음
+        with _sql_result_cache_lock:
+            _sql_result_cache[cache_key] = sql_result
+        return sql_result
     except Exception as e:
+        # 잘못된 SQL 등 요청 자체의 오류는 장애로 보지 않음
+        # (BigQuery가 응답한 것이므로 half-open 시험 호출은 성공으로 기록)
+        if isinstance(e, (api_exceptions.BadRequest, api_exceptions.NotFound, api_exceptions.Forbidden)):
+            _bq_breaker.record_success()
+        else:
+            _bq_breaker.record_failure()
         return f"Error executing BigQuery query: {str(e)}"
 
+def execute_bigquery_sql(sql: str, max_results: Optional[int] = None) -> str:
+    """Executes a BigQuery SQL query and returns the result as a JSON string.
+
+    max_results: optional upper bound on the number of rows to return.
+    """
+    logger.debug("Executing BigQuery SQL query: %s", sql)
+    cleaned_sql = clean_sql_query(sql)
+    logger.debug("Cleaned SQL query: %s", cleaned_sql)
+    # 줄바꿈이 공백으로 합쳐지므로 '--'로 시작하면 쿼리 전체가 주석
+    if not cleaned_sql or cleaned_sql.startswith("--"):
+        return "Query returned no results."
+    cache_key = (cleaned_sql, max_results)
+    with _sql_result_cache_lock:
+        cached_result = _sql_result_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    # single-flight: 같은 SQL이 동시에 들어오면 첫 요청의 결과를 함께 기다림
+    with _inflight_queries_lock:
+        inflight = _inflight_queries.get(cache_key)
+        is_leader = inflight is None
+        if is_leader:
+            inflight = Future()
+            _inflight_queries[cache_key] = inflight
+    if not is_leader:
+        return inflight.result()
+
+    try:
+        sql_result = _run_bigquery_sql(cleaned_sql, max_results, cache_key)
+        inflight.set_result(sql_result)
+        return sql_result
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        with _inflight_queries_lock:
+            _inflight_queries.pop(cache_key, None)
+
 # Get the project root directory (parent of stock_agent)
-_project_root = pathlib.Path(__file__).parent.parent
-_mcp_server_path = _project_root / "mcp_server" / "server.py"
-
-fundamentals_mcp_tool = MCPToolset(
-    connection_params=StdioConnectionParams(
-        server_params = StdioServerParameters(
-            command='fastmcp',
-            args=['run', f"{_mcp_server_path}:mcp", "--project", str(_project_root)],
-        ),
-        timeout=90,  # FnGuide 크롤링은 최대 60초 소요, 여유 30초 추가
-    ),
+_PROJECT_ROOT = str(pathlib.Path(__file__).resolve().parent.parent)
+
+
+class _ToolNameFilter:
+    """
+    허용 도구 이름을 frozenset으로 고정한 tool_filter.
+    ADK는 list 필터를 선형 탐색하고 다른 컬렉션 타입은 받지 않으므로
+    ToolPredicate(호출 가능 객체) 형태로 전달합니다.
+    """
+
+    def __init__(self, names):
+        self.names = frozenset(names)
+
+    def __call__(self, tool, readonly_context=None) -> bool:
+        return tool.name in self.names
+
+
+def _mcp_toolset(server_relpath: str, *, url_env: str, timeout: int, tool_filter: List[str]) -> MCPToolset:
+    """
+    mcp_server 아래 FastMCP 서버에 연결하는 MCPToolset 생성.
+
+    url_env 환경변수에 URL이 있으면 상주 중인 서버에 Streamable HTTP로 연결하고
+    (예: fastmcp run mcp_server/market.py:mcp --transport http --port 8766 → http://localhost:8766/mcp),
+    없으면 기존처럼 stdio 서브프로세스를 띄웁니다.
+    """
+    server_url = os.getenv(url_env)
+    if server_url:
+        connection_params = StreamableHTTPConnectionParams(url=server_url, timeout=timeout)
+    else:
+        connection_params = StdioConnectionParams(
+            server_params=StdioServerParameters(
+                command='fastmcp',
+                args=['run', f"{_PROJECT_ROOT}/{server_relpath}:mcp", "--project", _PROJECT_ROOT],
+            ),
+            timeout=timeout,
+        )
+    return MCPToolset(connection_params=connection_params, tool_filter=_ToolNameFilter(tool_filter))
+
+
+fundamentals_mcp_tool = _mcp_toolset(
+    "mcp_server/server.py",
+    url_env="FUNDAMENTALS_MCP_URL",
+    timeout=90,  # FnGuide 크롤링은 최대 60초 소요, 여유 30초 추가
     tool_filter=[
         'find_fnguide_data',
         'find_yahoofinance_data',
         'get_yahoofinance_fundamentals',  # 재무제표 3종 자동 수집
+        'get_yahoofinance_fundamentals_batch',  # 여러 티커 동시 수집
         'save_fundamentals_data_to_gcs'
     ],
 )
 
-_market_mcp_path = _project_root / "mcp_server" / "market.py"
-
-market_mcp_tool = MCPToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command='fastmcp',
-            args=['run', f"{_market_mcp_path}:mcp", "--project", str(_project_root)],
-        ),
-        timeout=30,
-    ),
+market_mcp_tool = _mcp_toolset(
+    "mcp_server/market.py",
+    url_env="MARKET_MCP_URL",
+    timeout=30,
     tool_filter=['collect_market_data', 'process_market_data', 'save_market_data_to_gcs'],
 )
 
-_gcloud_mcp_path = _project_root / "mcp_server" / "gcloud.py"
-
-gcloud_mcp_tool = MCPToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command='fastmcp',
-            args=['run', f"{_gcloud_mcp_path}:mcp", "--project", str(_project_root)],
-        ),
-        timeout=60,  # Increased timeout for potentially long-running cloud operations
-    ),
-    tool_filter=['list_gcs_files', 'read_gcs_file', 'fetch_and_save_market_data_to_bq', 'save_data_to_bq'],
-)
\ No newline at end of file
+gcloud_mcp_tool = _mcp_toolset(
+    "mcp_server/gcloud.py",
+    url_env="GCLOUD_MCP_URL",
+    timeout=60,  # Increased timeout for potentially long-running cloud operations
+    tool_filter=['list_gcs_files', 'read_gcs_file', 'fetch_and_save_market_data_to_bq', 'fetch_and_save_bulk_market_data_to_bq', 'save_data_to_bq', 'export_bq_query_to_gcs'],
+)
+
+MCP_TOOLSETS = (fundamentals_mcp_tool, market_mcp_tool, gcloud_mcp_tool)
+
+
+async def warmup_mcp_toolsets(toolsets=MCP_TOOLSETS) -> None:
+    """
+    stdio MCP 서버 프로세스를 미리 띄우고 세션 핸드셰이크를 끝내 둡니다.
+    세션은 이벤트 루프에 묶이므로 에이전트를 실행할 루프에서 호출해야 합니다.
+    """
+    results = await asyncio.gather(
+        *(toolset.get_tools() for toolset in toolsets),
+        return_exceptions=True,
+    )
+    for toolset, result in zip(toolsets, results):
+        if isinstance(result, BaseException):
+            logger.warning("MCP toolset warmup failed for %s: %s", toolset, result)
+        else:
+            logger.info("MCP toolset warmed up with %d tools", len(result))
+
+
+async def close_mcp_toolsets(toolsets=MCP_TOOLSETS) -> None:
+    """MCP 세션을 닫고 stdio 서버 프로세스를 종료합니다 (서버 종료 시 호출)."""
+    results = await asyncio.gather(
+        *(toolset.close() for toolset in toolsets),
+        return_exceptions=True,
+    )
+    for toolset, result in zip(toolsets, results):
+        if isinstance(result, BaseException):
+            logger.warning("MCP toolset close failed for %s: %s", toolset, result)
@@ -52,30 +52,45 @@ class companydict:
         }
     }
 
+    # 별칭/코드 → 회사 정보 조회 테이블 (선형 탐색 대신 O(1) 조회)
+    # reversed로 만들어 중복 별칭이 있으면 선형 탐색과 같이 앞쪽 항목이 우선
+    _alias_index = {
+        alias: company_info
+        for company_info in reversed(temp_dict.values())
+        for alias in company_info['company']
+    }
+    _casefold_alias_index = {
+        alias.casefold(): company_info
+        for company_info in reversed(temp_dict.values())
+        for alias in company_info['company']
+    }
+    _code_index = {
+        company_info['code']: company_name
+        for company_name, company_info in reversed(temp_dict.items())
+    }
+
+    @staticmethod
+    def _lookup(user_input):
+        company_info = companydict._alias_index.get(user_input)
+        if company_info is None and isinstance(user_input, str):
+            company_info = companydict._casefold_alias_index.get(user_input.strip().casefold())
+        return company_info
+
     @staticmethod
     def get_code(user_input):
-        for company_info in companydict.temp_dict.values():
-            if user_input in company_info['company']:
-                return company_info['code']
-        return None
-        
+        company_info = companydict._lookup(user_input)
+        return company_info['code'] if company_info else None
+
     @staticmethod
     def get_ticker(user_input):
-        for company_info in companydict.temp_dict.values():
-            if user_input in company_info['company']:
-                return company_info['ticker']
-        return None
-    
+        company_info = companydict._lookup(user_input)
+        return company_info['ticker'] if company_info else None
+
     @staticmethod
     def get_company(user_input):
-        for company_info in companydict.temp_dict.values():
-            if user_input in company_info['company']:
-                return company_info['company'][0]
-        return None
+        company_info = companydict._lookup(user_input)
+        return company_info['company'][0] if company_info else None
 
     @staticmethod
     def get_company_by_code(code_input):
-        for company_name, company_info in companydict.temp_dict.items():
-            if code_input == company_info['code']:
-                return company_name
-        return None
\ No newline at end of file
+        return companydict._code_index.get(code_input)
@@ -4,7 +4,7 @@ FnGuide 크롤러 - 정적/동적 재무 데이터 수집 + GCS 저장
 FnGuide 웹사이트에서 기업 재무 정보를 크롤링하여 GCS에 저장합니다.
 
 주요 기능:
-- 정적 테이블: requests + pandas.read_html로 시장 상황, 지배구조 등 수집
+- 정적 테이블: requests + lxml로 시장 상황, 지배구조 등 수집
 - 동적 테이블: Playwright로 포괄손익계산서, 재무상태표, 현금흐름표 수집
 - GCS 연동: 파티션 기반 폴더 구조(year=YYYY/quarter=Q/)로 데이터 저장
 - 캐싱: use_cache 파라미터로 기존 데이터 재사용
@@ -17,6 +17,7 @@ FnGuide 웹사이트에서 기업 재무 정보를 크롤링하여 GCS에 저장
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # playwright 임포트는 사용자 요청에 따라 유지 (현재 미사용)
 from playwright.async_api import (  # noqa: F401
@@ -24,12 +25,23 @@ from playwright.async_api import (  # noqa: F401
     TimeoutError as PlaywrightTimeoutError,  # noqa: F401
 )
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-from io import StringIO
-import json
+from functools import lru_cache
+from io import BytesIO, StringIO
+import csv
+import orjson
+import os
 import sys
+import threading
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from cachetools import TTLCache
+import lxml.html
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from types import MappingProxyType
 from typing import Any
 
 # 직접 실행 시를 위한 경로 설정
@@ -42,6 +54,50 @@ if __name__ == "__main__":
 # 파티션 폴더명 접두사 (GCS 저장 경로용)
 QUARTER_PREFIX = "quarter="
 
+# 정적 HTML 스트리밍 파싱 시 청크 크기 (bytes)
+STATIC_HTML_CHUNK_SIZE = 64 * 1024
+
+def _records_to_json(records: list[dict]) -> str:
+    """레코드 리스트를 JSON 문자열로 직렬화 (orjson은 UTF-8 bytes를 바로 생성, 한글 이스케이프 없음)"""
+    return orjson.dumps(records).decode()
+
+
+# 동적 페이지 파싱 시 테이블 요소만 트리로 구성
+_TABLES_ONLY = SoupStrainer("table")
+
+# GCS 폴더 목록 캐시 유지 시간 (초)
+LISTING_CACHE_TTL_SECONDS = 300
+# 종목/분기별 재무제표 결과를 프로세스 메모리에 보관하는 시간 (GCS 캐시 앞단)
+RESULT_CACHE_TTL_SECONDS = 3600
+
+# GCS 읽기/쓰기 동시 실행 스레드 수
+GCS_IO_MAX_WORKERS = 8
+
+# FnGuide 요청 헤더/타임아웃 (초)
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 10
+
+
+def _build_session() -> requests.Session:
+    """keep-alive 커넥션 풀과 gzip 응답을 사용하는 FnGuide 전용 세션 생성"""
+    session = requests.Session()
+    session.headers.update(
+        {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# 텍스트가 있는 테이블만 선택 (pandas.read_html의 테이블 인덱스와 일치시키기 위함)
+_NON_EMPTY_TABLE_XPATH = "//table[.//text()[re:test(., '.+')]]"
+_EXSLT_REGEX_NS = {"re": "http://exslt.org/regular-expressions"}
+
 
 class FnGuideCrawler:
     """FnGuide 데이터 크롤러 - 동적/정적 테이블 수집 + GCS 저장"""
@@ -63,6 +119,33 @@ class FnGuideCrawler:
     # Playwright로 가져올 동적 테이블
     DYNAMIC_TABLE_TITLES = ["포괄손익계산서", "재무상태표", "현금흐름표"]
 
+    # GCS 저장 형식 ("csv" 또는 "parquet", 읽기는 두 형식 모두 지원)
+    # fundamentals_fnguide_bronze 외부 테이블이 *.csv를 참조하므로 기본값은 CSV 유지
+    _CACHE_CONTENT_TYPES = {
+        "csv": "text/csv; charset=utf-8",
+        "parquet": "application/vnd.apache.parquet",
+    }
+    CACHE_FILE_FORMAT = os.getenv("FNGUIDE_CACHE_FORMAT", "csv").lower()
+    if CACHE_FILE_FORMAT not in _CACHE_CONTENT_TYPES:
+        CACHE_FILE_FORMAT = "csv"
+
+    # 레거시 폴더에서 캐시로 인정하는 파일 확장자
+    _LEGACY_EXTENSIONS = frozenset({"json", "csv", "parquet"})
+
+    # 버킷 이름별 GCSManager (크롤러 인스턴스 간 클라이언트/커넥션 풀 공유)
+    _shared_gcs: dict[str, Any] = {}
+
+    # 버킷/폴더별 GCS 파일 목록 TTL 캐시 (크롤러 인스턴스/스레드 간 공유)
+    _listing_cache: TTLCache = TTLCache(maxsize=256, ttl=LISTING_CACHE_TTL_SECONDS)
+    _listing_lock = threading.Lock()
+
+    # (버킷, 종목, 연도, 분기)별 재무제표 3종 결과 TTL 캐시 (반복 조회 시 GCS GET 생략)
+    _result_cache: TTLCache = TTLCache(maxsize=2048, ttl=RESULT_CACHE_TTL_SECONDS)
+    _result_lock = threading.Lock()
+
+    # 정적/동적 페이지 요청과 크롤러 인스턴스 간에 공유하는 HTTP 세션
+    _session: requests.Session = _build_session()
+
     def __init__(self, stock: str = "005930", bucket_name: str = "sayouzone-ai-stocks"):
         """
         FnGuide 크롤러 초기화
@@ -78,7 +161,7 @@ class FnGuideCrawler:
         self.dynamic_url = f"https://comp.fnguide.com/SVO2/ASP/SVD_Finance.asp?pGB=1&gicode=A{stock}&cID=&MenuYn=Y&ReportGB=&NewMenuID=103&stkGb=701"
         self._translator = _FnGuideTranslator()
 
-        # GCS Manager 초기화 (지연 초기화 패턴)
+        # GCS Manager 초기화 (지연 초기화 패턴, 클래스 단위 공유)
         self.bucket_name = bucket_name
         self._gcs = None
         self._gcs_initialized = False
@@ -98,53 +181,61 @@ class FnGuideCrawler:
 
         return key or "value"
 
-    def _dataframe_to_records(self, frame: pd.DataFrame) -> list[dict[str, Any]]:
+    def _columns_to_records(
+        self,
+        index_list: list[str],
+        data_dict: dict[tuple[str, str], list[str]],
+    ) -> list[dict[str, Any]]:
         """
-        DataFrame을 JSON 직렬화를 위한 레코드 리스트로 변환한다.
+        {컬럼 튜플: 기간별 값} 딕셔너리를 DataFrame 없이 레코드 리스트로 변환한다.
 
-        멀티인덱스 컬럼은 " / "로 결합된 단일 키로 변환하고,
-        인덱스(기간)는 'period' 필드로 포함한다.
+        튜플 컬럼은 " / "로 결합된 단일 키로 변환하고(중복 시 "_2", "_3" 접미사),
+        기간(index_list)은 'period' 필드로 포함한다.
         """
-        if frame.empty:
+        if not data_dict or not index_list:
             return []
 
-        flattened_columns = [self._flatten_column_key(col) for col in frame.columns]
-        records: list[dict[str, Any]] = []
-
-        for index_label, row in frame.iterrows():
-            record: dict[str, Any] = {"period": str(index_label)}
-            for key, value in zip(flattened_columns, row.tolist()):
-                if key in record:
-                    suffix = 2
+        # 키 변환/중복 처리는 모든 행에서 동일하므로 한 번만 계산
+        keys: list[str] = []
+        used = {"period"}
+        for column in data_dict:
+            key = self._flatten_column_key(column)
+            if key in used:
+                suffix = 2
+                new_key = f"{key}_{suffix}"
+                while new_key in used:
+                    suffix += 1
                     new_key = f"{key}_{suffix}"
-                    while new_key in record:
-                        suffix += 1
-                        new_key = f"{key}_{suffix}"
-                    record[new_key] = value
-                else:
-                    record[key] = value
-            records.append(record)
+                key = new_key
+            used.add(key)
+            keys.append(key)
 
-        return records
+        columns = list(data_dict.values())
+        return [
+            {"period": str(period), **{key: values[i] for key, values in zip(keys, columns)}}
+            for i, period in enumerate(index_list)
+        ]
 
     @property
     def gcs(self):
-        """GCS Manager 지연 초기화"""
+        """GCS Manager 지연 초기화 (버킷별로 크롤러 인스턴스 간 공유)"""
         if not self._gcs_initialized:
-            try:
-                from utils.gcpmanager import GCSManager
-            except ModuleNotFoundError:
-                # 직접 실행 시 상대 import
-                from ..gcpmanager import GCSManager
+            if self.bucket_name not in FnGuideCrawler._shared_gcs:
+                try:
+                    from utils.gcpmanager import GCSManager
+                except ModuleNotFoundError:
+                    # 직접 실행 시 상대 import
+                    from ..gcpmanager import GCSManager
 
-            try:
-                self._gcs = GCSManager(bucket_name=self.bucket_name)
-                print(f"✓ GCS Manager 초기화 성공")
-            except Exception as e:
-                print(f"⚠ GCS Manager 초기화 실패: {e}")
-                print(f"  (로컬 테스트 모드로 계속 진행합니다)")
-                self._gcs = None
+                try:
+                    FnGuideCrawler._shared_gcs[self.bucket_name] = GCSManager(bucket_name=self.bucket_name)
+                    print(f"✓ GCS Manager 초기화 성공")
+                except Exception as e:
+                    print(f"⚠ GCS Manager 초기화 실패: {e}")
+                    print(f"  (로컬 테스트 모드로 계속 진행합니다)")
+                    FnGuideCrawler._shared_gcs[self.bucket_name] = None
 
+            self._gcs = FnGuideCrawler._shared_gcs[self.bucket_name]
             self._gcs_initialized = True
 
         return self._gcs
@@ -196,6 +287,14 @@ class FnGuideCrawler:
         existing_files: dict[str, str] | None = None
         cached_data: dict[str, list[dict]] | None = None
 
+        # 프로세스 메모리 캐시를 GCS보다 먼저 확인
+        result_key = (self.bucket_name, self.stock, today.year, quarter)
+        if use_cache and not overwrite:
+            with FnGuideCrawler._result_lock:
+                cached_result = FnGuideCrawler._result_cache.get(result_key)
+            if cached_result is not None:
+                return dict(cached_result)
+
         # 캐시 사용 로직 (GCS가 사용 가능한 경우에만)
         if use_cache and self.gcs is not None:
             # GCS에서 기존 파일 목록 수집
@@ -213,7 +312,7 @@ class FnGuideCrawler:
             )
             # 캐시가 있고 overwrite=False이면 새 스키마로 변환하여 반환
             if cached_data is not None and not overwrite:
-                return self._convert_to_new_schema(cached_data)
+                return self._remember_result(result_key, self._convert_to_new_schema(cached_data))
         elif use_cache and self.gcs is None:
             print(
                 "⚠ GCS를 사용할 수 없어 캐시를 사용할 수 없습니다. 새로 크롤링합니다."
@@ -230,31 +329,27 @@ class FnGuideCrawler:
         # 데이터 수집
         raw_data = {}
 
-        # 1. 정적 테이블 수집은 GCS에만 저장 (기존 호환성 유지)
-        static_data = self._get_static_tables()
-        raw_data.update(static_data)
+        # 1~2. 정적 테이블(GCS 저장용)과 동적 테이블(재무제표 3종)은 서로 다른 페이지이므로
+        #      두 요청을 동시에 보내 네트워크 대기 시간을 겹친다.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            static_future = executor.submit(self._get_static_tables)
+            dynamic_future = executor.submit(self._get_dynamic_tables)
+            static_data = static_future.result()
+            dynamic_data = dynamic_future.result()
 
-        # 2. 동적 테이블 수집 (requests + bs4로 재무제표 3종)
-        dynamic_data = self._get_dynamic_tables()
+        raw_data.update(static_data)
         raw_data.update(dynamic_data)
 
-        # 3. GCS 업로드용 CSV 페이로드 생성
-        csv_payloads: dict[str, str] = {}
-        for name, records in raw_data.items():
-            if records:  # 빈 리스트가 아닐 때만 CSV 변환
-                try:
-                    df = pd.DataFrame(records)
-                    csv_payloads[name] = df.to_csv(index=False)
-                except Exception as e:
-                    print(f"'{name}' CSV 변환 실패: {e}")
-                    csv_payloads[name] = ""
-            else:
-                csv_payloads[name] = ""
+        # 3. GCS 업로드용 페이로드 생성 (CACHE_FILE_FORMAT에 따라 CSV 또는 Parquet)
+        payloads: dict[str, str | bytes] = {
+            name: self._serialize_records(name, records)
+            for name, records in raw_data.items()
+        }
 
         # 4. GCS에 업로드 (GCS가 사용 가능한 경우에만)
         if self.gcs is not None:
             self.upload_to_gcs(
-                csv_payloads,
+                payloads,
                 folder_name=folder_name,
                 file_base=file_base,
                 existing_files=existing_files,
@@ -284,9 +379,7 @@ class FnGuideCrawler:
 
         # 재무상태표 (포괄손익계산서 → income_statement)
         if "포괄손익계산서" in dynamic_data and dynamic_data["포괄손익계산서"]:
-            result["income_statement"] = json.dumps(
-                dynamic_data["포괄손익계산서"], ensure_ascii=False
-            )
+            result["income_statement"] = _records_to_json(dynamic_data["포괄손익계산서"])
             print(
                 f"[DEBUG] income_statement 변환 완료: {len(result['income_statement'])} bytes"
             )
@@ -295,9 +388,7 @@ class FnGuideCrawler:
 
         # 재무상태표
         if "재무상태표" in dynamic_data and dynamic_data["재무상태표"]:
-            result["balance_sheet"] = json.dumps(
-                dynamic_data["재무상태표"], ensure_ascii=False
-            )
+            result["balance_sheet"] = _records_to_json(dynamic_data["재무상태표"])
             print(
                 f"[DEBUG] balance_sheet 변환 완료: {len(result['balance_sheet'])} bytes"
             )
@@ -306,15 +397,148 @@ class FnGuideCrawler:
 
         # 현금흐름표
         if "현금흐름표" in dynamic_data and dynamic_data["현금흐름표"]:
-            result["cash_flow"] = json.dumps(
-                dynamic_data["현금흐름표"], ensure_ascii=False
-            )
+            result["cash_flow"] = _records_to_json(dynamic_data["현금흐름표"])
             print(f"[DEBUG] cash_flow 변환 완료: {len(result['cash_flow'])} bytes")
         else:
             print(f"[DEBUG] 현금흐름표 데이터 없음")
 
+        return self._remember_result(result_key, result)
+
+    @classmethod
+    def _remember_result(
+        cls, result_key: tuple, result: dict[str, str | None]
+    ) -> dict[str, str | None]:
+        """재무제표 3종 결과를 메모리 캐시에 저장하고 그대로 반환 (호출 측 수정에 대비해 사본 보관)"""
+        with cls._result_lock:
+            cls._result_cache[result_key] = dict(result)
         return result
 
+    def _serialize_records(self, name: str, records: list[dict]) -> str | bytes:
+        """
+        레코드 리스트를 CACHE_FILE_FORMAT 형식의 업로드 페이로드로 직렬화
+
+        Parquet은 pyarrow로 DataFrame을 거치지 않고 바로 변환하며(zstd 압축),
+        컬럼 키는 문자열이어야 하므로 _flatten_column_key로 정규화한다.
+
+        Args:
+            name: 테이블명 (로그용)
+            records: 레코드 리스트
+
+        Returns:
+            str | bytes: CSV 문자열 또는 Parquet bytes (변환 실패 시 빈 페이로드)
+        """
+        if self.CACHE_FILE_FORMAT == "parquet":
+            try:
+                table = pa.Table.from_pylist(
+                    [
+                        {self._flatten_column_key(key): value for key, value in record.items()}
+                        for record in records
+                    ]
+                )
+                buffer = BytesIO()
+                pq.write_table(table, buffer, compression="zstd")
+                return buffer.getvalue()
+            except Exception as e:
+                print(f"'{name}' Parquet 변환 실패: {e}")
+                return b""
+
+        if not records:  # 빈 리스트가 아닐 때만 CSV 변환
+            return ""
+        try:
+            return self._records_to_csv(records)
+        except Exception as e:
+            print(f"'{name}' CSV 변환 실패: {e}")
+            return ""
+
+    @classmethod
+    def _records_to_csv(cls, records: list[dict]) -> str:
+        """
+        레코드 리스트를 DataFrame 생성 없이 CSV 문자열로 직렬화
+
+        헤더는 모든 레코드의 키를 처음 등장한 순서대로 합친 것이며(DataFrame과 동일),
+        None/NaN은 빈 칸으로 기록한다. 튜플(멀티인덱스) 키는 _flatten_column_key로
+        단일 헤더로 변환한다.
+        """
+        flattened = [
+            {cls._flatten_column_key(key): value for key, value in record.items()}
+            for record in records
+        ]
+        fieldnames = list(dict.fromkeys(key for record in flattened for key in record))
+
+        buffer = StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+        writer.writeheader()
+        for record in flattened:
+            writer.writerow(
+                {
+                    key: "" if value is None or value is pd.NA or value != value else value
+                    for key, value in record.items()
+                }
+            )
+        return buffer.getvalue()
+
+    def _current_blob_candidates(
+        self, folder_name: str, file_base: str, name: str
+    ) -> list[str]:
+        """
+        현재 파티션 폴더의 테이블 blob 후보 (저장 형식 우선, 다른 형식도 포함)
+        """
+        formats = [self.CACHE_FILE_FORMAT] + [
+            fmt for fmt in self._CACHE_CONTENT_TYPES if fmt != self.CACHE_FILE_FORMAT
+        ]
+        candidates: list[str] = []
+        for fmt in formats:
+            candidates.extend(
+                self._expand_candidates(f"{folder_name}{file_base}_{name}.{fmt}")
+            )
+        return candidates
+
+    @classmethod
+    def scrape_many(
+        cls,
+        stocks: list[str],
+        *,
+        concurrency: int = 5,
+        use_cache: bool = False,
+        overwrite: bool = True,
+        bucket_name: str = "sayouzone-ai-stocks",
+    ) -> dict[str, dict[str, str | None] | None]:
+        """
+        여러 종목의 재무제표를 제한된 동시성으로 수집
+
+        종목마다 별도의 크롤러 인스턴스를 사용하고, HTTP 세션과 GCSManager는
+        클래스 단위로 공유한다. 한 종목이 실패해도 나머지 종목은 계속 수집한다.
+
+        Args:
+            stocks: 종목 코드 리스트
+            concurrency: 동시에 수집할 최대 종목 수
+            use_cache: True일 경우 GCS에서 캐시된 데이터 조회 시도
+            overwrite: False일 경우 기존 파일이 있으면 덮어쓰지 않음
+            bucket_name: GCS 버킷 이름
+
+        Returns:
+            dict: {종목 코드: get_all_fundamentals() 결과 또는 실패 시 None}
+        """
+        unique_stocks = list(dict.fromkeys(stocks))
+        if not unique_stocks:
+            return {}
+
+        def _scrape(stock: str) -> dict[str, str | None]:
+            crawler = cls(stock=stock, bucket_name=bucket_name)
+            return crawler.get_all_fundamentals(use_cache=use_cache, overwrite=overwrite)
+
+        results: dict[str, dict[str, str | None] | None] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(unique_stocks)))) as executor:
+            futures = {stock: executor.submit(_scrape, stock) for stock in unique_stocks}
+            for stock, future in futures.items():
+                try:
+                    results[stock] = future.result()
+                except Exception as e:
+                    print(f"⚠ {stock} 수집 실패: {e}")
+                    results[stock] = None
+
+        return results
+
     def _convert_to_new_schema(
         self, cached_data: dict[str, list[dict]]
     ) -> dict[str, str | None]:
@@ -337,21 +561,15 @@ class FnGuideCrawler:
 
         # 포괄손익계산서 → income_statement
         if "포괄손익계산서" in cached_data and cached_data["포괄손익계산서"]:
-            result["income_statement"] = json.dumps(
-                cached_data["포괄손익계산서"], ensure_ascii=False
-            )
+            result["income_statement"] = _records_to_json(cached_data["포괄손익계산서"])
 
         # 재무상태표 → balance_sheet
         if "재무상태표" in cached_data and cached_data["재무상태표"]:
-            result["balance_sheet"] = json.dumps(
-                cached_data["재무상태표"], ensure_ascii=False
-            )
+            result["balance_sheet"] = _records_to_json(cached_data["재무상태표"])
 
         # 현금흐름표 → cash_flow
         if "현금흐름표" in cached_data and cached_data["현금흐름표"]:
-            result["cash_flow"] = json.dumps(
-                cached_data["현금흐름표"], ensure_ascii=False
-            )
+            result["cash_flow"] = _records_to_json(cached_data["현금흐름표"])
 
         return result
 
@@ -392,20 +610,36 @@ class FnGuideCrawler:
         """
         정적 HTML 테이블 수집
 
-        requests로 HTML을 가져온 후 pandas.read_html()로 파싱하여
+        공유 세션으로 HTML을 가져온 후 lxml로 파싱하여
         시장 상황, 지배구조, 주주 현황 등의 정적 데이터를 수집
 
+        pandas.read_html()은 페이지의 모든 테이블을 DataFrame으로 만들기 때문에,
+        STATIC_TABLE_MAP에 있는 테이블만 직접 변환한다.
+
         Returns:
             dict[str, list[dict]]: 테이블명을 키로 하는 레코드 딕셔너리
         """
-        response = requests.get(self.static_url)
-        response.raise_for_status()
-        tables = pd.read_html(StringIO(response.text))
+        # 응답을 문자열로 버퍼링/디코딩하지 않고 받는 즉시 파서에 청크 단위로 전달
+        with self._session.get(
+            self.static_url, stream=True, timeout=REQUEST_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            # 헤더에 charset이 명시된 경우에만 지정 (없으면 lxml이 meta 태그로 판단)
+            content_type = response.headers.get("Content-Type", "").lower()
+            parser = lxml.html.HTMLParser(
+                encoding=response.encoding if "charset" in content_type else None
+            )
+            for chunk in response.iter_content(chunk_size=STATIC_HTML_CHUNK_SIZE):
+                parser.feed(chunk)
+            root = parser.close()
+
+        tables = self._visible_tables(root)
 
         datasets = {}
         for name, index in self.STATIC_TABLE_MAP:
             if index < len(tables):
-                frame = tables[index]
+                # 필요한 테이블만 DataFrame으로 변환
+                frame = self._table_to_frame(tables[index])
                 # 한글 컬럼명을 영문으로 번역
                 frame = self._translator.translate_dataframe(
                     frame,
@@ -420,12 +654,48 @@ class FnGuideCrawler:
 
         return datasets
 
+    @staticmethod
+    def _visible_tables(root: Any) -> list[Any]:
+        """
+        pandas.read_html()과 같은 순서/기준으로 테이블 목록 반환
+
+        텍스트가 없는 테이블과 display:none 테이블은 제외한다.
+
+        Args:
+            root: lxml.html 문서 루트
+
+        Returns:
+            list: lxml table 요소 리스트
+        """
+        return [
+            table
+            for table in root.xpath(_NON_EMPTY_TABLE_XPATH, namespaces=_EXSLT_REGEX_NS)
+            if "display:none" not in table.get("style", "").replace(" ", "")
+        ]
+
+    @staticmethod
+    def _table_to_frame(table: Any) -> pd.DataFrame:
+        """
+        lxml table 요소를 DataFrame으로 변환
+
+        파싱 규칙(colspan/rowspan, 헤더, 숫자 변환)은 기존과 동일하게
+        pandas.read_html()에 맡기고, 선택된 테이블 하나만 넘겨 변환 비용을 줄인다.
+
+        Args:
+            table: lxml table 요소
+
+        Returns:
+            pd.DataFrame: 변환된 테이블
+        """
+        html = lxml.html.tostring(table, encoding="unicode")
+        return pd.read_html(StringIO(html), flavor="lxml")[0]
+
     def _get_dynamic_tables(self) -> dict[str, list[dict]]:
         """
         동적 테이블 수집 (requests + BeautifulSoup 사용)
 
         재무제표 3종(포괄손익계산서, 재무상태표, 현금흐름표)을
-        requests와 BeautifulSoup으로 크롤링하여 멀티인덱스 DataFrame으로 구조화
+        requests와 BeautifulSoup으로 크롤링하여 기간별 레코드로 구조화
 
         Returns:
             dict[str, list[dict]]: 테이블명을 키로 하는 레코드 딕셔너리
@@ -434,25 +704,22 @@ class FnGuideCrawler:
 
         # requests로 페이지 가져오기
         print(f"페이지 요청 중: {self.dynamic_url}")
-        response = requests.get(self.dynamic_url)
+        response = self._session.get(self.dynamic_url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
-        # BeautifulSoup으로 파싱
-        soup = BeautifulSoup(response.text, "html.parser")
+        # BeautifulSoup으로 파싱 (순수 Python html.parser 대신 C 기반 lxml 파서 사용)
+        # 스크립트/스타일/이미지 등 테이블 외 요소는 트리로 만들지 않는다
+        soup = BeautifulSoup(response.text, "lxml", parse_only=_TABLES_ONLY)
+
+        # 타이틀마다 전체 테이블을 다시 훑지 않도록 한 번의 순회로 대상 테이블을 찾는다
+        target_tables = self._find_tables_by_title(soup, self.DYNAMIC_TABLE_TITLES)
 
         # 모든 테이블 데이터 수집
         for title in self.DYNAMIC_TABLE_TITLES:
             try:
                 print(f"\n{title} 데이터 수집 중...")
 
-                # 해당 타이틀을 포함하는 테이블 찾기
-                tables = soup.find_all("table")
-                target_table = None
-                for table in tables:
-                    if title in table.get_text():
-                        target_table = table
-                        break
-
+                target_table = target_tables.get(title)
                 if not target_table:
                     print(f"  - ⚠️ {title} 테이블을 찾을 수 없음")
                     result_dict[title] = []
@@ -588,16 +855,10 @@ class FnGuideCrawler:
 
                     print(f"  - 처리 완료: {processed_count}/{len(tbody_trs)} 행")
 
-                # 3. DataFrame 생성
+                # 3. 레코드 생성 (기간별 1행, 컬럼은 ("유동자산", "현금및현금성자산") 등의 튜플)
                 if data_dict and index_list:
-                    df = pd.DataFrame(data_dict, index=index_list)
-
-                    # 4. 멀티인덱스로 columns 변환
-                    #    예: ("유동자산", "현금및현금성자산"), ("유동자산", "단기투자자산") ...
-                    df.columns = pd.MultiIndex.from_tuples(df.columns)
-
-                    result_dict[title] = self._dataframe_to_records(df)
-                    print(f"  - 완료! DataFrame shape: {df.shape}")
+                    result_dict[title] = self._columns_to_records(index_list, data_dict)
+                    print(f"  - 완료! shape: ({len(index_list)}, {len(data_dict)})")
                 else:
                     print(f"  - 데이터 없음")
                     result_dict[title] = []
@@ -608,6 +869,33 @@ class FnGuideCrawler:
 
         return result_dict
 
+    @staticmethod
+    def _find_tables_by_title(soup: BeautifulSoup, titles: list[str]) -> dict[str, Any]:
+        """
+        각 타이틀을 처음으로 포함하는 테이블을 찾는다.
+
+        테이블마다 get_text()는 한 번만 호출하고, 모든 타이틀을 찾으면 즉시 중단한다.
+
+        Args:
+            soup: 파싱된 페이지
+            titles: 찾을 테이블 타이틀 목록
+
+        Returns:
+            dict[str, Any]: {타이틀: table 태그} (찾지 못한 타이틀은 제외)
+        """
+        remaining = list(titles)
+        found: dict[str, Any] = {}
+
+        for table in soup.find_all("table"):
+            if not remaining:
+                break
+            text = table.get_text()
+            for title in [t for t in remaining if t in text]:
+                found[title] = table
+                remaining.remove(title)
+
+        return found
+
     # ==================== GCS 연동 메서드 ====================
 
     def _load_from_gcs(
@@ -637,22 +925,45 @@ class FnGuideCrawler:
                 legacy_folder,
             )
 
-        cached_data: dict[str, list[dict]] = {}
+        # 모든 테이블의 blob이 있는지 먼저 확인하고, 하나라도 없으면 다운로드 없이 종료
+        selected_blobs = self._resolve_all_blobs(folder_name, file_base, existing_files)
+        if selected_blobs is None:
+            return None
+
+        return self._download_all(selected_blobs)
+
+    def _resolve_all_blobs(
+        self,
+        folder_name: str,
+        file_base: str,
+        existing_files: dict[str, str],
+    ) -> dict[str, str] | None:
+        """
+        정적 + 동적 테이블 전체에 대해 캐시 blob 선택
 
-        # 정적 + 동적 테이블 모두 확인
+        파일 목록(existing_files)만 조회하므로 GCS 호출이 없다.
+
+        Args:
+            folder_name: 현재 파티션 폴더 경로
+            file_base: 파일명 접두사 (종목 코드)
+            existing_files: 기존 파일 목록
+
+        Returns:
+            dict[str, str] | None: {테이블명: blob 경로} 또는 None (하나라도 없음)
+        """
         all_table_names = [
             name for name, _ in self.STATIC_TABLE_MAP
         ] + self.DYNAMIC_TABLE_TITLES
 
+        legacy_index = self._index_legacy_blobs(
+            existing_files, file_base=file_base, names=all_table_names
+        )
+
+        selected_blobs: dict[str, str] = {}
         for name in all_table_names:
-            new_blob = f"{folder_name}{file_base}_{name}.csv"
-            candidate_names = self._expand_candidates(new_blob)
+            candidate_names = self._current_blob_candidates(folder_name, file_base, name)
             candidate_names.extend(
-                self._legacy_candidate_blobs(
-                    name=name,
-                    file_base=file_base,
-                    existing_files=existing_files,
-                )
+                self._legacy_candidate_blobs(name=name, legacy_index=legacy_index)
             )
 
             # 후보 중 실제 존재하는 파일 찾기
@@ -662,34 +973,118 @@ class FnGuideCrawler:
             )
             if not selected_blob:
                 return None  # 하나라도 없으면 전체 캐시 무효
+            selected_blobs[name] = selected_blob
 
-            # GCS에서 파일 읽기
-            content = self.gcs.read_file(selected_blob)
-            if content is None:
-                return None
+        return selected_blobs
 
-            # CSV 또는 JSON 파싱
-            if selected_blob.endswith(".csv"):
-                try:
-                    frame = pd.read_csv(StringIO(content))
-                except pd.errors.EmptyDataError:
-                    frame = pd.DataFrame()
-                cached_data[name] = frame.to_dict(orient="records")
-            else:
-                try:
-                    payload = json.loads(content)
-                except json.JSONDecodeError:
+    def _download_all(self, selected_blobs: dict[str, str]) -> dict[str, list[dict]] | None:
+        """
+        선택된 blob을 동시에 읽어 레코드로 파싱
+
+        GCS 읽기는 서로 독립적이므로 스레드 풀로 동시에 수행한다 (Parquet은 bytes로).
+
+        Args:
+            selected_blobs: _resolve_all_blobs() 결과
+
+        Returns:
+            dict[str, list[dict]] | None: 캐시된 데이터 또는 None (읽기/파싱 실패)
+        """
+        if not selected_blobs:
+            return {}
+
+        cached_data: dict[str, list[dict]] = {}
+        with ThreadPoolExecutor(
+            max_workers=min(GCS_IO_MAX_WORKERS, len(selected_blobs))
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self.gcs.read_file,
+                    blob,
+                    as_bytes=blob.endswith(".parquet"),
+                ): name
+                for name, blob in selected_blobs.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                records = self._parse_cached_blob(selected_blobs[name], future.result())
+                if records is None:
+                    # 하나라도 읽기/파싱에 실패하면 남은 다운로드를 취소하고 캐시 무효
+                    for pending in futures:
+                        pending.cancel()
                     return None
-                if isinstance(payload, list):
-                    cached_data[name] = payload
-                else:
-                    cached_data[name] = []
+                cached_data[name] = records
+
+        # 테이블 순서를 기존과 동일하게 유지
+        return {name: cached_data[name] for name in selected_blobs}
+
+    @staticmethod
+    def _read_cached_csv(content: str) -> pd.DataFrame:
+        """
+        캐시 CSV를 DataFrame으로 읽기 (새로 수집한 결과와 같은 값/타입 유지)
+
+        pyarrow 멀티스레드 CSV 파서를 사용하되, 날짜처럼 보이는 문자열은 문자열로 유지합니다.
+        중복 헤더가 있으면 pyarrow는 컬럼을 조용히 버리므로 기본 C 엔진(``2023/12.1``)으로 읽습니다.
+        """
+        data = content.encode("utf-8")
+        try:
+            table = pa_csv.read_csv(BytesIO(data))
+        except pa.ArrowInvalid:
+            table = None
+        if table is None or len(set(table.column_names)) != table.num_columns:
+            try:
+                return pd.read_csv(StringIO(content))
+            except pd.errors.EmptyDataError:
+                return pd.DataFrame()
+
+        temporal_columns = {
+            field.name: pa.string()
+            for field in table.schema
+            if pa.types.is_temporal(field.type)
+        }
+        if temporal_columns:
+            # 날짜/시각으로 추론된 컬럼만 문자열 타입으로 지정하여 원문 그대로 다시 읽음
+            table = pa_csv.read_csv(
+                BytesIO(data),
+                convert_options=pa_csv.ConvertOptions(column_types=temporal_columns),
+            )
+        return table.to_pandas()
+
+    @staticmethod
+    def _parse_cached_blob(blob_name: str, content: str | bytes | None) -> list[dict] | None:
+        """
+        캐시 blob 내용을 레코드 리스트로 파싱
+
+        Args:
+            blob_name: blob 경로 (확장자로 형식 판단)
+            content: read_file() 결과
+
+        Returns:
+            list[dict] | None: 레코드 리스트 또는 None (읽기/파싱 실패)
+        """
+        if content is None:
+            return None
 
-        return cached_data
+        # Parquet, CSV 또는 JSON 파싱
+        if blob_name.endswith(".parquet"):
+            try:
+                return pq.read_table(BytesIO(content)).to_pylist() if content else []
+            except Exception:
+                return None
+        if blob_name.endswith(".csv"):
+            if not content.strip():
+                return []
+            frame = FnGuideCrawler._read_cached_csv(content)
+            return frame.to_dict(orient="records")
+
+        try:
+            payload = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return None
+        return payload if isinstance(payload, list) else []
 
     def upload_to_gcs(
         self,
-        serialized_payloads: dict[str, str],
+        serialized_payloads: dict[str, str | bytes],
         *,
         folder_name: str,
         file_base: str,
@@ -698,10 +1093,10 @@ class FnGuideCrawler:
         legacy_folder: str | None = None,
     ) -> None:
         """
-        CSV 페이로드를 GCS에 업로드
+        CSV/Parquet 페이로드를 GCS에 업로드 (형식은 CACHE_FILE_FORMAT)
 
         Args:
-            serialized_payloads: {테이블명: CSV 문자열} 딕셔너리
+            serialized_payloads: {테이블명: CSV 문자열 또는 Parquet bytes} 딕셔너리
             folder_name: 업로드 폴더 경로
             file_base: 파일명 접두사 (종목 코드)
             existing_files: 기존 파일 목록
@@ -725,33 +1120,53 @@ class FnGuideCrawler:
         # 폴더 생성 (플레이스홀더 파일)
         self.gcs.ensure_folder(folder_name)
 
+        legacy_index = self._index_legacy_blobs(
+            existing_files, file_base=file_base, names=serialized_payloads.keys()
+        )
+
+        # 1. 업로드 대상 선별 (overwrite=False이고 이미 파일이 있으면 스킵)
+        tasks: list[tuple[str, str | bytes]] = []
         for name, payload in serialized_payloads.items():
-            new_blob = f"{folder_name}{file_base}_{name}.csv"
-            candidate_names = self._expand_candidates(new_blob)
+            new_blob = f"{folder_name}{file_base}_{name}.{self.CACHE_FILE_FORMAT}"
+            candidate_names = self._current_blob_candidates(folder_name, file_base, name)
             candidate_names.extend(
-                self._legacy_candidate_blobs(
-                    name=name,
-                    file_base=file_base,
-                    existing_files=existing_files,
-                )
+                self._legacy_candidate_blobs(name=name, legacy_index=legacy_index)
             )
 
-            # overwrite=False이고 이미 파일이 있으면 스킵
             if not overwrite:
                 if self._resolve_existing_blob(candidate_names, existing_files):
                     continue
 
-            # GCS 업로드
-            target_blob_name = new_blob.lstrip("/")
-            uploaded = self.gcs.upload_file(
-                source_file=payload,
-                destination_blob_name=target_blob_name,
-                encoding="utf-8",
-                content_type="text/csv; charset=utf-8",
+            tasks.append((new_blob.lstrip("/"), payload))
+
+        if not tasks:
+            return
+
+        # 2. GCS 업로드는 서로 독립적이므로 스레드 풀로 동시에 수행
+        content_type = self._CACHE_CONTENT_TYPES[self.CACHE_FILE_FORMAT]
+        with ThreadPoolExecutor(max_workers=min(GCS_IO_MAX_WORKERS, len(tasks))) as executor:
+            results = list(
+                executor.map(
+                    lambda task: self.gcs.upload_file(
+                        source_file=task[1],
+                        destination_blob_name=task[0],
+                        encoding="utf-8",
+                        content_type=content_type,
+                    ),
+                    tasks,
+                )
             )
 
-            # 업로드 성공 시 파일 목록 갱신
-            if uploaded and existing_files is not None:
+        # 3. 업로드 성공 시 파일 목록 갱신 (풀 종료 후 단일 스레드에서 수정)
+        uploaded_blobs = [
+            target_blob_name
+            for (target_blob_name, _), uploaded in zip(tasks, results)
+            if uploaded
+        ]
+        self._remember_uploaded(folder_name, uploaded_blobs)
+
+        if existing_files is not None:
+            for target_blob_name in uploaded_blobs:
                 existing_files[target_blob_name] = target_blob_name
                 normalized = target_blob_name.lstrip("/")
                 existing_files.setdefault(normalized, target_blob_name)
@@ -783,8 +1198,8 @@ class FnGuideCrawler:
                 continue
             seen_folders.add(candidate_folder)
 
-            # GCS에서 폴더 내 파일 목록 가져오기
-            for blob_name in self.gcs.list_files(folder_name=candidate_folder):
+            # GCS에서 폴더 내 파일 목록 가져오기 (TTL 캐시 사용)
+            for blob_name in self._list_folder(candidate_folder):
                 mapping.setdefault(blob_name, blob_name)
                 # 앞의 '/' 제거한 버전도 매핑에 추가
                 normalized = blob_name.lstrip("/")
@@ -792,6 +1207,34 @@ class FnGuideCrawler:
 
         return mapping
 
+    def _list_folder(self, folder_name: str) -> list[str]:
+        """
+        폴더의 blob 목록 조회 (버킷/폴더별 TTL 캐시)
+
+        여러 종목을 연속으로 수집할 때 같은 분기 폴더를 매번 다시 조회하지 않는다.
+        업로드한 파일은 _remember_uploaded()로 캐시에 반영한다.
+        """
+        cache_key = (self.bucket_name, folder_name)
+        with FnGuideCrawler._listing_lock:
+            cached = FnGuideCrawler._listing_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+        blob_names = list(self.gcs.list_files(folder_name=folder_name))
+        with FnGuideCrawler._listing_lock:
+            FnGuideCrawler._listing_cache[cache_key] = blob_names
+        return list(blob_names)
+
+    def _remember_uploaded(self, folder_name: str, blob_names: list[str]) -> None:
+        """업로드에 성공한 blob을 캐시된 폴더 목록에 추가"""
+        cache_key = (self.bucket_name, folder_name)
+        with FnGuideCrawler._listing_lock:
+            cached = FnGuideCrawler._listing_cache.get(cache_key)
+            if cached is None:
+                return
+            known = set(cached)
+            cached.extend(name for name in blob_names if name not in known)
+
     def _expand_candidates(self, blob_name: str) -> list[str]:
         """
         Blob 이름 정규화 후보 생성
@@ -809,29 +1252,30 @@ class FnGuideCrawler:
             return [blob_name, normalized]
         return [blob_name]
 
-    def _legacy_candidate_blobs(
+    def _index_legacy_blobs(
         self,
+        existing_files: dict[str, str],
         *,
-        name: str,
         file_base: str,
-        existing_files: dict[str, str],
-    ) -> list[str]:
+        names: Any,
+    ) -> dict[str, list[str]]:
         """
-        레거시 폴더 구조의 후보 blob 탐색
+        레거시 폴더 구조의 blob을 테이블명별로 한 번에 색인
 
-        구 폴더 구조(/Fundamentals/FnGuide/{stock}/{year}-Q{quarter}/raw/)에서
-        해당 테이블 파일이 있는지 확인
+        구 폴더 구조(/Fundamentals/FnGuide/{stock}/{year}-Q{quarter}/raw/)의 파일 중
+        종목 코드를 포함하고 "_{테이블명}.json/.csv/.parquet"로 끝나는 파일을 찾는다.
+        테이블마다 전체 파일 목록을 다시 훑지 않도록 파일 목록을 한 번만 순회한다.
 
         Args:
-            name: 테이블명
-            file_base: 종목 코드
             existing_files: 기존 파일 목록
+            file_base: 종목 코드
+            names: 색인할 테이블명 목록
 
         Returns:
-            list[str]: 레거시 후보 blob 경로 리스트
+            dict[str, list[str]]: {테이블명: 실제 blob 경로 리스트}
         """
-        suffixes = (f"_{name}.json", f"_{name}.csv")
-        matches: list[str] = []
+        table_names = set(names)
+        index: dict[str, list[str]] = {}
         seen: set[str] = set()
 
         for key, actual in existing_files.items():
@@ -843,17 +1287,46 @@ class FnGuideCrawler:
             if file_base not in normalized_key:
                 continue
 
-            # 테이블명 확장자로 끝나는지 확인
-            if not normalized_key.endswith(suffixes):
-                continue
-
             # 새 파티션 폴더는 제외 (레거시만)
             if normalized_key.startswith("Fundamentals/FnGuide/year="):
                 continue
 
-            seen.add(actual)
-            matches.extend(self._expand_candidates(actual))
+            stem, _, extension = normalized_key.rpartition(".")
+            if extension not in self._LEGACY_EXTENSIONS:
+                continue
+
+            # "{접두사}_{테이블명}"에서 테이블명 추출 (테이블명에 밑줄이 있을 수 있어 앞에서부터 시도)
+            basename = stem.rsplit("/", 1)[-1]
+            position = basename.find("_")
+            while position != -1:
+                name = basename[position + 1:]
+                if name in table_names:
+                    seen.add(actual)
+                    index.setdefault(name, []).append(actual)
+                    break
+                position = basename.find("_", position + 1)
 
+        return index
+
+    def _legacy_candidate_blobs(
+        self,
+        *,
+        name: str,
+        legacy_index: dict[str, list[str]],
+    ) -> list[str]:
+        """
+        레거시 폴더 구조의 후보 blob 탐색 (_index_legacy_blobs 결과에서 O(1) 조회)
+
+        Args:
+            name: 테이블명
+            legacy_index: _index_legacy_blobs()로 만든 색인
+
+        Returns:
+            list[str]: 레거시 후보 blob 경로 리스트
+        """
+        matches: list[str] = []
+        for actual in legacy_index.get(name, ()):
+            matches.extend(self._expand_candidates(actual))
         return matches
 
     def _resolve_existing_blob(
@@ -994,7 +1467,7 @@ class _FnGuideTranslator:
             stock_code: 종목 코드 (회사명을 "company"로 치환하기 위해 사용)
 
         Returns:
-            pd.DataFrame: 컬럼명이 번역된 DataFrame
+            pd.DataFrame: 컬럼명이 번역된 DataFrame (입력 DataFrame을 그대로 수정)
         """
         if frame.empty:
             return frame
@@ -1018,29 +1491,27 @@ class _FnGuideTranslator:
                 except (ImportError, ModuleNotFoundError):
                     pass
 
-        translated = frame.copy()
-
+        # 호출자가 소유한 DataFrame이므로 복사하지 않고 컬럼 라벨만 교체
         # 멀티인덱스 처리
-        if isinstance(translated.columns, pd.MultiIndex):
+        if isinstance(frame.columns, pd.MultiIndex):
             new_columns = []
-            for column in translated.columns:
+            for column in frame.columns:
                 # 각 레벨별로 번역
                 new_columns.append(
                     tuple(
                         self._translate_token(level, company_name) for level in column
                     )
                 )
-            translated.columns = pd.MultiIndex.from_tuples(
-                new_columns, names=translated.columns.names
+            frame.columns = pd.MultiIndex.from_tuples(
+                new_columns, names=frame.columns.names
             )
         # 단일 인덱스 처리
         else:
-            translated.rename(
-                columns=lambda label: self._translate_token(label, company_name),
-                inplace=True,
-            )
+            frame.columns = [
+                self._translate_token(label, company_name) for label in frame.columns
+            ]
 
-        return translated
+        return frame
 
     def _translate_token(self, label: str, company_name: str | None) -> str:
         """
@@ -1055,15 +1526,7 @@ class _FnGuideTranslator:
         """
         if not isinstance(label, str):
             return label
-
-        normalized = self._normalize(label)
-
-        # 회사명이면 "company"로 통일
-        if company_name and normalized == company_name:
-            return "company"
-
-        # 매핑 딕셔너리에서 찾기 (없으면 원본 그대로)
-        return self._COLUMN_MAP.get(normalized, normalized)
+        return _translate_label(label, company_name)
 
     @staticmethod
     def _normalize(value: str) -> str:
@@ -1079,6 +1542,27 @@ class _FnGuideTranslator:
         return value.replace("\xa0", " ").strip()
 
 
+# 모듈 로드 시 한 번만 키를 정규화한 읽기 전용 번역 매핑
+_COLUMN_MAP_FROZEN = MappingProxyType(
+    {
+        _FnGuideTranslator._normalize(key): value
+        for key, value in _FnGuideTranslator._COLUMN_MAP.items()
+    }
+)
+
+
+# 정적 테이블 헤더는 크롤러 인스턴스와 무관하게 같으므로 (라벨, 회사명)별 번역 결과를 프로세스 단위로 재사용
+@lru_cache(maxsize=4096)
+def _translate_label(label: str, company_name: str | None) -> str:
+    normalized = _FnGuideTranslator._normalize(label)
+
+    # 회사명이면 "company"로 통일
+    if company_name and normalized == company_name:
+        return "company"
+    # 정규화된 키로 미리 만든 매핑에서 찾기 (없으면 원본 그대로)
+    return _COLUMN_MAP_FROZEN.get(normalized, normalized)
+
+
 # ==================== 하위 호환성 함수 ====================
 
 
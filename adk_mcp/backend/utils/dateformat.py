@@ -0,0 +1,10 @@
+from datetime import date
+
+import pandas as pd
+
+
+def format_date_column(dates: pd.Series) -> pd.Series:
+    """날짜 컬럼을 레코드별 루프 대신 컬럼 단위로 'YYYY-MM-DD' 문자열로 변환합니다."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime('%Y-%m-%d')
+    return dates.map(lambda value: value.strftime('%Y-%m-%d') if isinstance(value, date) else value)
@@ -1,9 +1,22 @@
+import gzip
+import io
 import logging
 import os
-from datetime import datetime
+import posixpath
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import requests
-from google.cloud import storage, bigquery, exceptions, secretmanager
+from google.cloud import storage, bigquery, bigquery_storage_v1, exceptions, secretmanager
+from google.cloud.bigquery_storage_v1 import types as bq_storage_types
+
+
+# read_file에서 blob 메타데이터 조회를 본문 다운로드와 병렬로 실행하기 위한 공용 스레드 풀
+_GCS_READ_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gcs-read")
 
 
 def get_gcp_project_id():
@@ -70,6 +83,34 @@ class SecretManager:
             else:
                 logging.warning(f"시크릿 '{secret_id}'를 로드하지 못했습니다.")
 
+    def load_secrets_into_env_parallel(self, secrets_to_load: list[str]):
+        """
+        시크릿 목록을 동시에 가져와 환경 변수로 로드합니다.
+
+        하나의 클라이언트(gRPC 채널)를 공유하면서 요청만 스레드로 겹치므로,
+        시작 시 시크릿 조회 지연이 시크릿 개수만큼 누적되지 않습니다.
+        """
+        if not self._secret_manager_available:
+            logging.error("Secret Manager를 사용할 수 없어 시크릿을 로드할 수 없습니다.")
+            return
+        if not secrets_to_load:
+            return
+
+        logging.info(f"시크릿 병렬 로드 중: {secrets_to_load}")
+        with ThreadPoolExecutor(max_workers=len(secrets_to_load)) as executor:
+            futures = {
+                executor.submit(self.access_secret_version, secret_id): secret_id
+                for secret_id in secrets_to_load
+            }
+            for future in as_completed(futures):
+                secret_id = futures[future]
+                secret_value = future.result()
+                if secret_value is not None:
+                    os.environ[secret_id] = secret_value
+                    logging.info(f"시크릿 '{secret_id}'를 환경 변수로 로드했습니다.")
+                else:
+                    logging.warning(f"시크릿 '{secret_id}'를 로드하지 못했습니다.")
+
 class GCSManager:
     def __init__(self, bucket_name="sayouzone-ai-stocks"):
         self.bucket_name = bucket_name
@@ -121,7 +162,17 @@ class GCSManager:
             print(f"파일 목록 조회 중 심각한 에러 발생: {e}")
             return []
 
-    def upload_file(self, source_file, destination_blob_name, *, encoding: str = "utf-8", content_type: str | None = None):
+    def upload_file(
+        self,
+        source_file,
+        destination_blob_name,
+        *,
+        encoding: str = "utf-8",
+        content_type: str | None = None,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+        custom_time: datetime | None = None,
+    ):
         normalized_name = self._normalize_blob_name(destination_blob_name)
         if not normalized_name:
             normalized_name = destination_blob_name
@@ -133,7 +184,23 @@ class GCSManager:
             bucket = self.storage_client.bucket(self.bucket_name)
             blob = bucket.blob(normalized_name)
 
-            if isinstance(source_file, str):
+            upload_kwargs = {"content_type": content_type} if content_type else {}
+            if content_encoding:
+                blob.content_encoding = content_encoding
+            if cache_control:
+                blob.cache_control = cache_control
+            if custom_time:
+                # 수명 주기 규칙(daysSinceCustomTime)으로 만료시키기 위한 기준 시각
+                blob.custom_time = custom_time
+
+            # 메모리 버퍼는 단일 요청(multipart) 업로드로 보내고,
+            # 그 외 바이너리 스트림은 bytes로 복사하지 않고 그대로 업로드 (resumable upload)
+            if isinstance(source_file, io.BytesIO):
+                payload = source_file.getvalue()
+            elif isinstance(source_file, (io.BufferedIOBase, io.RawIOBase)):
+                payload = None
+                blob.upload_from_file(source_file, rewind=True, **upload_kwargs)
+            elif isinstance(source_file, str):
                 payload = source_file.encode(encoding)
             elif isinstance(source_file, (bytes, bytearray)):
                 payload = bytes(source_file)
@@ -148,8 +215,8 @@ class GCSManager:
             else:
                 raise TypeError("source_file must be a str, bytes-like, or readable object")
 
-            upload_kwargs = {"content_type": content_type} if content_type else {}
-            blob.upload_from_string(payload, **upload_kwargs)
+            if payload is not None:
+                blob.upload_from_string(payload, **upload_kwargs)
             try:
                 blob.reload()
             except Exception:
@@ -164,7 +231,82 @@ class GCSManager:
             print(f"파일 업로드 중 심각한 에러 발생: {e}")
             return False
     
-    def read_file(self, blob_name):
+    def upload_dataframe(
+        self,
+        df: pd.DataFrame,
+        destination_blob_name: str,
+        *,
+        file_format: str = "parquet",
+        cache_control: str | None = None,
+        custom_time: datetime | None = None,
+    ) -> str | None:
+        """
+        DataFrame을 Parquet(기본) 또는 CSV로 직렬화하여 업로드합니다.
+
+        pyarrow Table로 변환한 뒤 upload_arrow_table로 업로드합니다.
+
+        Returns:
+            str | None: 업로드된 blob 이름 (실패 시 None)
+        """
+        return self.upload_arrow_table(
+            pa.Table.from_pandas(df, preserve_index=False),
+            destination_blob_name,
+            file_format=file_format,
+            cache_control=cache_control,
+            custom_time=custom_time,
+        )
+
+    def upload_arrow_table(
+        self,
+        table: pa.Table,
+        destination_blob_name: str,
+        *,
+        file_format: str = "parquet",
+        cache_control: str | None = None,
+        custom_time: datetime | None = None,
+    ) -> str | None:
+        """
+        pyarrow Table을 Parquet(기본) 또는 CSV로 직렬화하여 업로드합니다.
+
+        Parquet은 snappy로 압축하고, CSV는 gzip으로 압축하여 Content-Encoding: gzip으로
+        업로드합니다. pyarrow의 C++ 작성기로 메모리 버퍼에 기록하며,
+        blob 이름의 확장자는 file_format에 맞게 교체됩니다.
+
+        Returns:
+            str | None: 업로드된 blob 이름 (실패 시 None)
+        """
+        root, _ = posixpath.splitext(destination_blob_name)
+        buffer = io.BytesIO()
+        content_encoding = None
+        if file_format == "parquet":
+            pq.write_table(table, buffer, compression="snappy")
+            content_type = "application/octet-stream"
+        elif file_format == "csv":
+            with gzip.GzipFile(fileobj=buffer, mode="wb") as gz:
+                pa_csv.write_csv(table, gz)
+            content_type = "text/csv"
+            content_encoding = "gzip"
+        else:
+            raise ValueError("file_format must be 'parquet' or 'csv'.")
+
+        blob_name = f"{root}.{file_format}"
+        uploaded = self.upload_file(
+            source_file=buffer.getvalue(),
+            destination_blob_name=blob_name,
+            content_type=content_type,
+            content_encoding=content_encoding,
+            cache_control=cache_control,
+            custom_time=custom_time,
+        )
+        return blob_name if uploaded else None
+
+    def read_file(self, blob_name, *, max_age: timedelta | None = None, as_bytes: bool = False):
+        """
+        blob 내용을 텍스트로 읽습니다 (as_bytes=True이면 bytes로 읽습니다).
+
+        max_age가 주어지면 blob의 마지막 수정 시각을 확인하여
+        max_age보다 오래된 경우 None을 반환합니다 (TTL 캐시 용도).
+        """
         print(f"파일 읽기 시작: '{blob_name}'")
         if not getattr(self, "_storage_available", False):
             print("GCS 클라이언트가 비활성화되어 파일을 읽을 수 없습니다.")
@@ -179,7 +321,18 @@ class GCSManager:
             for name in candidate_names:
                 try:
                     blob = bucket.blob(name)
-                    content = blob.download_as_text()
+                    if max_age is None:
+                        content = blob.download_as_bytes() if as_bytes else blob.download_as_text()
+                    else:
+                        # 메타데이터 조회와 본문 다운로드를 동시에 요청하여 왕복 지연을 한 번으로 줄임
+                        # (만료된 경우 내려받은 본문은 버림)
+                        metadata = bucket.blob(name)
+                        reload_future = _GCS_READ_EXECUTOR.submit(metadata.reload)
+                        content = blob.download_as_bytes() if as_bytes else blob.download_as_text()
+                        reload_future.result()
+                        if metadata.updated and datetime.now(timezone.utc) - metadata.updated > max_age:
+                            print(f"캐시 만료: '{name}' (마지막 수정: {metadata.updated.isoformat()})")
+                            return None
                     print("파일 읽기 성공!")
                     return content
                 except Exception:
@@ -217,8 +370,26 @@ class GCSManager:
             print(f"폴더 생성 중 에러 발생: {e}")
             return False
 
+# BigQuery 컬럼 타입 → Storage Write API에 보낼 Arrow 타입
+_BQ_TO_ARROW_TYPES = {
+    "STRING": pa.string(),
+    "INTEGER": pa.int64(),
+    "INT64": pa.int64(),
+    "FLOAT": pa.float64(),
+    "FLOAT64": pa.float64(),
+    "NUMERIC": pa.decimal128(38, 9),
+    "BOOLEAN": pa.bool_(),
+    "BOOL": pa.bool_(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "DATETIME": pa.timestamp("us"),
+}
+
+
 class BQManager:
     _dataset_checked = False
+    # AppendRows 요청 하나가 10MB 제한을 넘지 않도록 배치 크기를 제한
+    APPEND_ROWS_BATCH_SIZE = 10_000
 
     def __init__(self, project_id="sayouzone-ai"):
         self.project_id = project_id
@@ -228,6 +399,11 @@ class BQManager:
         except Exception as e:
             logging.warning("BigQuery 클라이언트 초기화 실패: %s", e)
             self.bq_client = None
+        try:
+            self.write_client = bigquery_storage_v1.BigQueryWriteClient()
+        except Exception as e:
+            logging.warning("BigQuery Storage Write 클라이언트 초기화 실패: %s", e)
+            self.write_client = None
         if self.bq_client and not BQManager._dataset_checked:
             if self._ensure_dataset_exists():
                 BQManager._dataset_checked = True
@@ -398,6 +574,93 @@ class BQManager:
             print(f"Failed to load dataframe: {e}")
             return False
 
+    @staticmethod
+    def arrow_schema_from_bq(schema: list[bigquery.SchemaField]) -> pa.Schema:
+        """BigQuery 테이블 스키마를 Storage Write API용 Arrow 스키마로 변환합니다."""
+        return pa.schema(
+            pa.field(field.name, _BQ_TO_ARROW_TYPES.get(field.field_type.upper(), pa.string()))
+            for field in schema
+        )
+
+    @staticmethod
+    def _to_arrow_table(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+        """DataFrame을 주어진 Arrow 스키마의 테이블로 변환합니다 (없는 컬럼은 null)."""
+        columns = []
+        for field in schema:
+            if field.name in df.columns:
+                column = pa.Array.from_pandas(df[field.name])
+            else:
+                column = pa.nulls(len(df), type=field.type)
+            if pa.types.is_decimal(field.type) and pa.types.is_floating(column.type):
+                # float → NUMERIC 변환은 Arrow(C++)에서 처리하여 Python Decimal 생성을 피함
+                column = pc.round(column, ndigits=field.type.scale)
+            if column.type != field.type:
+                column = column.cast(field.type)
+            columns.append(column)
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    def append_rows_arrow(self, df: pd.DataFrame, table_id: str, schema: pa.Schema | None = None) -> bool:
+        """
+        Storage Write API 기본 스트림으로 Arrow 배치를 스트리밍 적재합니다.
+        load job을 만들지 않으므로 소량의 잦은 append에 적합합니다.
+        schema를 넘기면 테이블 스키마 조회를 생략하고 해당 Arrow 스키마로 변환합니다.
+        테이블이 없으면 load_dataframe으로 생성 및 적재합니다.
+        """
+        if not self.bq_client or not self.write_client:
+            print("BigQuery 클라이언트가 비활성화되어 Arrow 적재를 수행하지 않습니다.")
+            return False
+
+        full_table_id = self._full_table_id(table_id)
+        if df.empty:
+            print("Dataframe is empty. Skipping load.")
+            return True
+
+        if schema is None:
+            try:
+                schema = self.arrow_schema_from_bq(self.bq_client.get_table(full_table_id).schema)
+            except exceptions.NotFound:
+                print(f"Table '{full_table_id}' not found. Falling back to load job...")
+                return self.load_dataframe(df, full_table_id, if_exists="append")
+
+        print(f"Appending {len(df)} rows to '{full_table_id}' via Storage Write API...")
+
+        try:
+            arrow_table = self._to_arrow_table(df, schema)
+            project, dataset, table_name = full_table_id.split(".")
+            write_stream = f"{self.write_client.table_path(project, dataset, table_name)}/streams/_default"
+
+            append_requests = []
+            for batch in arrow_table.to_batches(max_chunksize=self.APPEND_ROWS_BATCH_SIZE):
+                arrow_rows = bq_storage_types.AppendRowsRequest.ArrowData(
+                    rows=bq_storage_types.ArrowRecordBatch(
+                        serialized_record_batch=batch.serialize().to_pybytes()
+                    )
+                )
+                if not append_requests:
+                    # writer_schema는 연결의 첫 요청에만 포함
+                    arrow_rows.writer_schema = bq_storage_types.ArrowSchema(
+                        serialized_schema=arrow_table.schema.serialize().to_pybytes()
+                    )
+                append_requests.append(
+                    bq_storage_types.AppendRowsRequest(write_stream=write_stream, arrow_rows=arrow_rows)
+                )
+
+            for response in self.write_client.append_rows(iter(append_requests)):
+                if response.error.code or response.row_errors:
+                    print(f"Failed to append rows: {response.error.message or response.row_errors}")
+                    return False
+
+            print(f"Rows appended successfully into '{full_table_id}'.")
+            return True
+        except exceptions.NotFound:
+            print(f"Table '{full_table_id}' not found. Falling back to load job...")
+            return self.load_dataframe(
+                df.reindex(columns=schema.names), full_table_id, if_exists="append"
+            )
+        except Exception as e:
+            print(f"Failed to append rows: {e}")
+            return False
+
     def create_external_table(self):
         if not self.bq_client:
             print("BigQuery 클라이언트가 비활성화되어 테이블을 생성하지 않습니다.")
@@ -12,11 +12,29 @@ from typing import Dict, Any, Tuple, Optional
 NAVER_FINANCE_BASE_URL = 'https://finance.naver.com'
 NAVER_M_STOCK_API_BASE = 'https://m.stock.naver.com/api/stock'
 
-DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36'
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
 from utils.gcpmanager import BQManager
+from utils.dateformat import format_date_column
 
 
 HTML_PARSER = 'html.parser'
+DEFAULT_HTML_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7"
+
+# 요청마다 TCP/TLS 핸드셰이크를 반복하지 않도록 프로세스 단위로 공유하는 keep-alive 클라이언트
+_shared_client: httpx.AsyncClient | None = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            headers={'User-Agent': DEFAULT_USER_AGENT, 'Accept': DEFAULT_HTML_ACCEPT},
+            follow_redirects=True,
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _shared_client
 
 
 def _build_mobile_headers(company_code: str) -> Dict[str, str]:
@@ -57,9 +75,7 @@ class News:
         else:
             self.bq_manager = BQManager()
             
-        self.client = httpx.AsyncClient(headers={
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
-        }, follow_redirects=True)
+        self.client = get_shared_client()
 
     async def collect(self, query: str, max_articles: int = 100):
         table_id = f"news-naver-{query}"
@@ -168,15 +184,11 @@ class Market:
         else:
             self.bq_manager = BQManager()
 
-        self._header = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-            'Accept' : "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7"
-        }
         self.base_url = 'https://finance.naver.com'
         self.company = company or '005930'
         self.bq_manager = bq_manager
         self.company_dict = company_dict
-        self.client = httpx.AsyncClient(headers=self._header, follow_redirects=True)
+        self.client = get_shared_client()
 
     async def market_collect(self, company: str | None = None, start_date: str | None = None, end_date: str | None = None, max_page: int = 10):
         if company:
@@ -313,6 +325,7 @@ class Market:
 
         latest_close = float(latest['close']) if pd.notna(latest['close']) else 0.0
         latest_volume = int(latest['volume']) if pd.notna(latest['volume']) else 0
+        dates = format_date_column(df['date'])
 
         result = {
             "name": company_name or self.company,
@@ -329,18 +342,11 @@ class Market:
                 "value": market_cap,
                 "changePercent": 0 
             },
-            "priceHistory": df.rename(columns={'close': 'price'})[['date', 'price']].to_dict(orient='records'),
-            "volumeHistory": df[['date', 'volume']].to_dict(orient='records')
+            # 날짜 변환은 컬럼 단위로 끝내고 to_dict가 바로 JSON 호환 레코드를 만들도록 함
+            "priceHistory": pd.DataFrame({'date': dates, 'price': df['close']}).to_dict(orient='records'),
+            "volumeHistory": pd.DataFrame({'date': dates, 'volume': df['volume']}).to_dict(orient='records'),
         }
 
-        for item in result['priceHistory']:
-            if isinstance(item['date'], pd.Timestamp):
-                item['date'] = item['date'].strftime('%Y-%m-%d')
-
-        for item in result['volumeHistory']:
-            if isinstance(item['date'], pd.Timestamp):
-                item['date'] = item['date'].strftime('%Y-%m-%d')
-
         return result
 
 
@@ -348,53 +354,55 @@ async def _fetch_company_metadata(company_code: str) -> Dict[str, Any]:
     metadata: Dict[str, Any] = {}
     latest_price: float | None = None
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            basic_resp = await client.get(
-                f"{NAVER_M_STOCK_API_BASE}/{company_code}/basic",
-                headers=_build_mobile_headers(company_code),
-            )
-            basic_resp.raise_for_status()
-            basic_json = basic_resp.json()
-
-            metadata["company_name"] = basic_json.get("stockName")
-
-            exchange_info = basic_json.get("stockExchangeType") or {}
-            metadata["exchange"] = (
-                exchange_info.get("name")
-                or basic_json.get("stockExchangeName")
-            )
-            metadata["currency"] = (
-                _infer_currency(exchange_info.get("nationCode"))
-                or "KRW"
-            )
-
-            closing_price = basic_json.get("closePrice")
-            if closing_price is not None:
-                try:
-                    latest_price = float(str(closing_price).replace(',', ''))
-                except ValueError:
-                    latest_price = None
-        except Exception as exc:
-            metadata.setdefault("_errors", {})["basic"] = str(exc)
+    client = get_shared_client()
+    try:
+        basic_resp = await client.get(
+            f"{NAVER_M_STOCK_API_BASE}/{company_code}/basic",
+            headers=_build_mobile_headers(company_code),
+            timeout=15.0,
+        )
+        basic_resp.raise_for_status()
+        basic_json = basic_resp.json()
 
-        try:
-            summary_resp = await client.get(
-                f"https://api.finance.naver.com/service/itemSummary.naver?itemcode={company_code}",
-                headers=_build_summary_headers(company_code),
-            )
-            summary_resp.raise_for_status()
-            summary_json = summary_resp.json()
-            market_sum = summary_json.get("marketSum")
-            if isinstance(market_sum, (int, float)):
-                market_cap = float(market_sum) * 1_000_000  # marketSum is in million KRW
-                metadata["market_cap"] = market_cap
-                if latest_price and latest_price > 0:
-                    metadata["shares_outstanding"] = int(round(market_cap / latest_price))
-            else:
-                metadata.setdefault("_warnings", []).append("marketSum missing")
-        except Exception as exc:
-            metadata.setdefault("_errors", {})["summary"] = str(exc)
+        metadata["company_name"] = basic_json.get("stockName")
+
+        exchange_info = basic_json.get("stockExchangeType") or {}
+        metadata["exchange"] = (
+            exchange_info.get("name")
+            or basic_json.get("stockExchangeName")
+        )
+        metadata["currency"] = (
+            _infer_currency(exchange_info.get("nationCode"))
+            or "KRW"
+        )
+
+        closing_price = basic_json.get("closePrice")
+        if closing_price is not None:
+            try:
+                latest_price = float(str(closing_price).replace(',', ''))
+            except ValueError:
+                latest_price = None
+    except Exception as exc:
+        metadata.setdefault("_errors", {})["basic"] = str(exc)
+
+    try:
+        summary_resp = await client.get(
+            f"https://api.finance.naver.com/service/itemSummary.naver?itemcode={company_code}",
+            headers=_build_summary_headers(company_code),
+            timeout=15.0,
+        )
+        summary_resp.raise_for_status()
+        summary_json = summary_resp.json()
+        market_sum = summary_json.get("marketSum")
+        if isinstance(market_sum, (int, float)):
+            market_cap = float(market_sum) * 1_000_000  # marketSum is in million KRW
+            metadata["market_cap"] = market_cap
+            if latest_price and latest_price > 0:
+                metadata["shares_outstanding"] = int(round(market_cap / latest_price))
+        else:
+            metadata.setdefault("_warnings", []).append("marketSum missing")
+    except Exception as exc:
+        metadata.setdefault("_errors", {})["summary"] = str(exc)
 
     return metadata
 
@@ -495,16 +503,9 @@ async def fetch_market_dataframe(
         raise ValueError(f"Code for {company} not found.")
 
     crawled_df = pd.DataFrame()
-    async with httpx.AsyncClient(
-        headers={
-            'User-Agent': DEFAULT_USER_AGENT,
-            'Accept': "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        },
-        follow_redirects=True,
-    ) as client:
-        async for update in _crawl_price_history(company_code, client):
-            if update['type'] == 'result':
-                crawled_df = update['data']
+    async for update in _crawl_price_history(company_code, get_shared_client()):
+        if update['type'] == 'result':
+            crawled_df = update['data']
 
     if not crawled_df.empty:
         crawled_df = crawled_df[
@@ -9,6 +9,7 @@ from bs4 import BeautifulSoup, Tag
 import os
 from contextlib import contextmanager
 from typing import cast
+from concurrent.futures import ThreadPoolExecutor
 
 @contextmanager
 def change_dir(destination):
@@ -25,6 +26,9 @@ def change_dir(destination):
         if cwd is not None:
             os.chdir(cwd)
 
+# 공시 하나의 첨부파일을 동시에 내려받아 업로드할 최대 스레드 수
+ATTACHMENT_MAX_WORKERS = 4
+
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
 
 class OpenDartCrawler:
@@ -151,23 +155,30 @@ class OpenDartCrawler:
                 time.sleep(3)
                 continue
 
+            uploads = []
             for title, url in files.items():
                 fn = title if title else url.split("/")[-1]
                 if fn.endswith(".html"):
                     continue
-
-                # GCP Upload
-                try:
-                    file_name = fn.replace(".pdf", f"_{row.rcept_no}.pdf")
-                    r_file = requests.get(url, stream=True, headers={"User-Agent": USER_AGENT})
-                    r_file.raise_for_status()
-                    
-                    self.gcs_manager.upload_file(
-                        source_file=r_file.content,
-                        destination_blob_name=folder_path + file_name
-                    )
-                except requests.exceptions.RequestException as e:
-                    print(f"파일 다운로드/업로드 실패 (URL: {url}): {e}")
-                    continue
-
-            time.sleep(3)
\ No newline at end of file
+                file_name = fn.replace(".pdf", f"_{row.rcept_no}.pdf")
+                uploads.append((url, folder_path + file_name))
+
+            # 한 공시의 첨부파일들은 서로 독립적이므로 다운로드/GCS 업로드를 병렬로 수행
+            if uploads:
+                with ThreadPoolExecutor(max_workers=min(ATTACHMENT_MAX_WORKERS, len(uploads))) as executor:
+                    list(executor.map(lambda task: self._upload_attachment(*task), uploads))
+
+            time.sleep(3)
+
+    def _upload_attachment(self, url: str, destination_blob_name: str):
+        """첨부파일 하나를 내려받아 GCS에 업로드합니다 (실패 시 로그만 남기고 건너뜀)."""
+        try:
+            r_file = requests.get(url, stream=True, headers={"User-Agent": USER_AGENT})
+            r_file.raise_for_status()
+
+            self.gcs_manager.upload_file(
+                source_file=r_file.content,
+                destination_blob_name=destination_blob_name
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"파일 다운로드/업로드 실패 (URL: {url}): {e}")
\ No newline at end of file
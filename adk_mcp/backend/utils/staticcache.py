@@ -0,0 +1,122 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+from pathlib import Path
+from typing import NamedTuple
+
+# 미리 gzip 압축해 둘 콘텐츠 타입 (이미지/폰트 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+)
+# SvelteKit 빌드 산출물 중 파일명에 해시가 포함된 불변 자산 경로
+IMMUTABLE_PREFIX = "_app/immutable/"
+
+
+class StaticAsset(NamedTuple):
+    body: bytes
+    gzip_body: bytes | None
+    etag: bytes
+    content_type: bytes
+    cache_control: bytes
+
+
+class InMemoryStaticFiles:
+    """
+    빌드된 프론트엔드 번들을 시작 시 메모리에 올려 두고 서빙하는 ASGI 앱
+
+    요청마다 파일 stat/open/read와 ETag 계산을 하지 않도록 본문, gzip 본문, ETag,
+    Content-Type을 미리 계산합니다. 없는 경로는 index.html로 응답합니다 (SPA 라우팅).
+    """
+
+    def __init__(self, directory: str | Path, *, fallback: str = "index.html", compress_level: int = 6):
+        self.directory = Path(directory)
+        self.assets: dict[str, StaticAsset] = {}
+
+        total_bytes = 0
+        for file_path in sorted(self.directory.rglob("*")):
+            if not file_path.is_file():
+                continue
+            relative = file_path.relative_to(self.directory).as_posix()
+            self.assets[relative] = self._load_asset(relative, file_path.read_bytes(), compress_level)
+            total_bytes += len(self.assets[relative].body)
+
+        self.fallback = self.assets.get(fallback)
+        logging.info("Loaded %d frontend assets (%d bytes) into memory from %s", len(self.assets), total_bytes, self.directory)
+
+    @staticmethod
+    def _load_asset(relative: str, body: bytes, compress_level: int) -> StaticAsset:
+        content_type, _ = mimetypes.guess_type(relative)
+        content_type = content_type or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type = f"{content_type}; charset=utf-8"
+
+        gzip_body = None
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=compress_level, mtime=0)
+            if len(compressed) < len(body):
+                gzip_body = compressed
+
+        if relative.startswith(IMMUTABLE_PREFIX):
+            cache_control = "public, max-age=31536000, immutable"
+        else:
+            cache_control = "no-cache"
+
+        return StaticAsset(
+            body=body,
+            gzip_body=gzip_body,
+            etag=f'"{hashlib.md5(body).hexdigest()}"'.encode(),
+            content_type=content_type.encode(),
+            cache_control=cache_control.encode(),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await self._send(send, 405, [(b"allow", b"GET, HEAD")], b"Method Not Allowed", method)
+            return
+
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        asset = self.assets.get(path.lstrip("/")) or self.fallback
+        if asset is None:
+            await self._send(send, 404, [], b"Not Found", method)
+            return
+
+        request_headers = dict(scope["headers"])
+        headers = [
+            (b"etag", asset.etag),
+            (b"cache-control", asset.cache_control),
+            (b"vary", b"Accept-Encoding"),
+        ]
+        if asset.etag in (tag.strip() for tag in request_headers.get(b"if-none-match", b"").split(b",")):
+            await self._send(send, 304, headers, b"", method)
+            return
+
+        body = asset.body
+        if asset.gzip_body is not None and b"gzip" in request_headers.get(b"accept-encoding", b""):
+            body = asset.gzip_body
+            headers.append((b"content-encoding", b"gzip"))
+        headers.append((b"content-type", asset.content_type))
+        await self._send(send, 200, headers, body, method)
+
+    @staticmethod
+    async def _send(send, status: int, headers: list[tuple[bytes, bytes]], body: bytes, method: str):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [*headers, (b"content-length", str(len(body)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else body})
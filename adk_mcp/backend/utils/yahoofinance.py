@@ -1,5 +1,5 @@
 import os
-import json
+import msgspec
 import yfinance as yf
 import logging
 
@@ -10,11 +10,62 @@ from datetime import datetime, timedelta
 from typing import Literal, Tuple
 from utils.companydict import companydict as find
 from utils.gcpmanager import BQManager, GCSManager
+from utils.dateformat import format_date_column
 import requests
 from bs4 import BeautifulSoup
 import asyncio
 from typing import AsyncGenerator, Dict, Any
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+ISO_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+KR_TICKER_SUFFIXES = (".KS", ".KQ")
+MARKET_COLUMN_MAP = {
+    'Date': 'date',
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Adj Close': 'adj_close',
+    'Volume': 'volume',
+}
+
+
+def dataframe_to_records(frame: pd.DataFrame) -> list[dict[str, Any]]:
+    """
+    DataFrame을 JSON 직렬화 가능한 레코드 리스트로 변환합니다.
+
+    to_json → json.loads 왕복 없이 날짜 컬럼/라벨만 ISO 문자열로 바꾸고
+    NaN은 None으로 치환하여 to_dict(orient="records")로 바로 변환합니다.
+    """
+    converted = frame.copy(deep=False)
+    for column in converted.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        converted[column] = converted[column].dt.strftime(ISO_DATETIME_FORMAT)
+    converted.columns = [
+        label.strftime(ISO_DATETIME_FORMAT) if isinstance(label, datetime) else str(label)
+        for label in converted.columns
+    ]
+    # 결측치가 없으면 object 변환/치환 패스 없이 바로 레코드로 변환
+    mask = converted.notna()
+    if not mask.values.all():
+        converted = converted.astype(object).where(mask, None)
+    return converted.to_dict(orient="records")
+
+@lru_cache(maxsize=1)
+def _shared_gcs_manager() -> GCSManager:
+    """Fundamentals 인스턴스 간에 storage.Client(커넥션 풀)를 공유하는 GCSManager"""
+    return GCSManager()
+
+@lru_cache(maxsize=256)
+def _cached_ticker_info(ticker_symbol: str, period: str) -> dict[str, Any]:
+    """
+    yf.Ticker(...).info를 프로세스 내에서 캐싱합니다.
+
+    period(예: "2025-10")는 캐시 키로만 사용되어 월 단위로 만료됩니다.
+    예외는 캐싱되지 않으므로 실패 시 다음 호출에서 다시 요청합니다.
+    """
+    return yf.Ticker(ticker_symbol).info or {}
 
 class News:
     def __init__(self):
@@ -277,6 +328,7 @@ class Market:
 
         latest_close = float(latest['close']) if pd.notna(latest['close']) else 0.0
         latest_volume = int(latest['volume']) if pd.notna(latest['volume']) else 0
+        dates = format_date_column(df['date'])
 
         result = {
             "name": company_name,
@@ -293,21 +345,30 @@ class Market:
                 "value": market_cap,
                 "changePercent": 0 
             },
-            "priceHistory": df.rename(columns={'close': 'price'})[['date', 'price']].to_dict(orient='records'),
-            "volumeHistory": df[['date', 'volume']].to_dict(orient='records')
+            # 날짜/타입 변환은 컬럼 단위로 끝내고 to_dict가 바로 JSON 호환 레코드를 만들도록 함
+            "priceHistory": pd.DataFrame(
+                {'date': dates, 'price': df['close'].astype(float)}
+            ).to_dict(orient='records'),
+            "volumeHistory": pd.DataFrame(
+                {'date': dates, 'volume': df['volume'].astype('int64')}
+            ).to_dict(orient='records'),
         }
 
-        for item in result['priceHistory']:
-            if isinstance(item['date'], pd.Timestamp) or isinstance(item['date'], datetime.date):
-                item['date'] = pd.to_datetime(item['date']).strftime('%Y-%m-%d')
-            item['price'] = float(item['price'])
+        return result
 
-        for item in result['volumeHistory']:
-            if isinstance(item['date'], pd.Timestamp) or isinstance(item['date'], datetime.date):
-                item['date'] = pd.to_datetime(item['date']).strftime('%Y-%m-%d')
-            item['volume'] = int(item['volume'])
+class FundamentalsPayload(msgspec.Struct):
+    """GCS 캐시에 저장하는 재무제표 3종 페이로드 (각 재무제표는 to_json 문자열)"""
+    ticker: str
+    country: str = "Unknown"
+    balance_sheet: str | None = None
+    income_statement: str | None = None
+    cash_flow: str | None = None
+
+
+# 스키마가 고정된 캐시는 dict를 거치지 않고 Struct로 바로 디코딩/검증
+_FUNDAMENTALS_DECODER = msgspec.json.Decoder(FundamentalsPayload)
+_FUNDAMENTALS_ENCODER = msgspec.json.Encoder()
 
-        return result
 
 class Fundamentals:
     """
@@ -317,9 +378,18 @@ class Fundamentals:
     GCS 캐싱 기능은 유지하여 API 호출 비용을 최소화.
     """
     GCS_CACHE_PREFIX = "yahoofinance_fundamentals_cache"
+    # 재무제표는 분기 단위로 갱신되므로 GCS 캐시는 7일간 유효
+    CACHE_TTL = timedelta(days=7)
+
+    # 결과 키 -> yfinance.Ticker 속성명
+    STATEMENT_ATTRIBUTES = {
+        "balance_sheet": "balance_sheet",  # 재무상태표
+        "income_statement": "income_stmt",  # 손익계산서
+        "cash_flow": "cashflow",  # 현금흐름표
+    }
 
     def __init__(self):
-        self.gcs_manager = GCSManager()
+        self.gcs_manager = _shared_gcs_manager()
 
     def fundamentals(
         self,
@@ -361,7 +431,7 @@ class Fundamentals:
             if hasattr(ticker, attribute_name_str):
                 data = getattr(ticker, attribute_name_str)
                 if isinstance(data, pd.DataFrame):
-                    return json.loads(data.to_json(orient="records", date_format="iso"))
+                    return dataframe_to_records(data)
                 if isinstance(data, pd.Series):
                     return data.to_dict()
                 if isinstance(data, dict):
@@ -375,31 +445,30 @@ class Fundamentals:
 
         # 캐시 확인
         if use_cache and not overwrite:
-            cached_payload = self.gcs_manager.read_file(gcs_blob_name)
+            cached_payload = self.gcs_manager.read_file(gcs_blob_name, max_age=self.CACHE_TTL)
             if cached_payload:
                 try:
-                    payload = json.loads(cached_payload)
+                    payload = msgspec.structs.asdict(_FUNDAMENTALS_DECODER.decode(cached_payload))
                     logging.info(f"Returning cached fundamentals for {ticker_symbol} from GCS: {gcs_blob_name}")
                     return payload
-                except (json.JSONDecodeError, KeyError) as e:
+                except msgspec.DecodeError as e:
                     logging.warning(f"GCS cache read failed for {ticker_symbol} (corrupted JSON): {e}. Refetching.")
 
         # yfinance Ticker 객체 생성
         ticker = yf.Ticker(ticker_symbol)
 
-        # 국가 정보 추론
-        country = "Unknown"
-        try:
-            info = ticker.info or {}
-            country = info.get("country") or "Unknown"
-        except Exception as e:
-            logging.warning(f"Failed to fetch ticker info for {ticker_symbol}: {e}")
-
-        # 한국 종목 코드 패턴 확인
-        if ".KS" in ticker_symbol or ".KQ" in ticker_symbol:
+        # 국가 정보 추론: 한국 종목 코드 패턴이면 ticker.info 네트워크 호출 생략
+        if ticker_symbol.endswith(KR_TICKER_SUFFIXES):
             country = "KR"
-        elif ticker_symbol.replace(".KS", "").replace(".KQ", "").isdigit() and len(ticker_symbol.replace(".KS", "").replace(".KQ", "")) == 6:
+        elif len(ticker_symbol) == 6 and ticker_symbol.isdigit():
             country = "KR"
+        else:
+            country = "Unknown"
+            try:
+                info = _cached_ticker_info(ticker_symbol, datetime.now().strftime("%Y-%m"))
+                country = info.get("country") or "Unknown"
+            except Exception as e:
+                logging.warning(f"Failed to fetch ticker info for {ticker_symbol}: {e}")
 
         # 재무제표 3종 수집
         result = {
@@ -410,37 +479,28 @@ class Fundamentals:
             "cash_flow": None
         }
 
-        # 1. Balance Sheet (재무상태표)
-        try:
-            balance_sheet = ticker.balance_sheet
-            if balance_sheet is not None and not balance_sheet.empty:
-                result["balance_sheet"] = balance_sheet.to_json(orient="columns", date_format="iso")
-        except Exception as e:
-            logging.warning(f"Failed to fetch balance_sheet for {ticker_symbol}: {e}")
-
-        # 2. Income Statement (손익계산서)
-        try:
-            income_stmt = ticker.income_stmt
-            if income_stmt is not None and not income_stmt.empty:
-                result["income_statement"] = income_stmt.to_json(orient="columns", date_format="iso")
-        except Exception as e:
-            logging.warning(f"Failed to fetch income_stmt for {ticker_symbol}: {e}")
-
-        # 3. Cash Flow (현금흐름표)
-        try:
-            cashflow = ticker.cashflow
-            if cashflow is not None and not cashflow.empty:
-                result["cash_flow"] = cashflow.to_json(orient="columns", date_format="iso")
-        except Exception as e:
-            logging.warning(f"Failed to fetch cashflow for {ticker_symbol}: {e}")
+        # 재무제표 3종을 동시에 요청 (각 속성이 별도의 HTTPS 요청이므로 병렬화)
+        with ThreadPoolExecutor(max_workers=len(self.STATEMENT_ATTRIBUTES)) as executor:
+            futures = {
+                executor.submit(getattr, ticker, attribute): (key, attribute)
+                for key, attribute in self.STATEMENT_ATTRIBUTES.items()
+            }
+            for future in as_completed(futures):
+                key, attribute = futures[future]
+                try:
+                    statement = future.result()
+                    if statement is not None and not statement.empty:
+                        result[key] = statement.to_json(orient="columns", date_format="iso")
+                except Exception as e:
+                    logging.warning(f"Failed to fetch {attribute} for {ticker_symbol}: {e}")
 
         # GCS에 캐시 저장
         try:
-            payload_json = json.dumps(result, ensure_ascii=False, indent=2)
+            # UTF-8 bytes를 바로 만들어 str → bytes 인코딩 단계를 생략
+            payload_json = _FUNDAMENTALS_ENCODER.encode(FundamentalsPayload(**result))
             self.gcs_manager.upload_file(
                 source_file=payload_json,
                 destination_blob_name=gcs_blob_name,
-                encoding="utf-8",
                 content_type="application/json; charset=utf-8",
             )
             logging.info(f"Successfully cached fundamentals for {ticker_symbol} to GCS: {gcs_blob_name}")
@@ -450,6 +510,19 @@ class Fundamentals:
         return result
 
 
+def _market_metadata_fallback(ticker_symbol: str, company_name: str | None) -> Dict[str, Any]:
+    return {
+        "company_id": ticker_symbol,
+        "company_name": company_name or ticker_symbol,
+        "exchange": None,
+        "currency": "USD",
+        "market_cap": None,
+        "shares_outstanding": None,
+        "sector": None,
+        "source": "Yahoo",
+    }
+
+
 async def _collect_ticker_metadata(ticker: yf.Ticker, fallback: Dict[str, Any]) -> Dict[str, Any]:
     metadata: Dict[str, Any] = dict(fallback)
 
@@ -530,34 +603,80 @@ async def fetch_market_dataframe(
         return pd.DataFrame(), {}
 
     hist_df.reset_index(inplace=True)
-    hist_df.rename(
-        columns={
-            'Date': 'date',
-            'Open': 'open',
-            'High': 'high',
-            'Low': 'low',
-            'Close': 'close',
-            'Adj Close': 'adj_close',
-            'Volume': 'volume',
-        },
-        inplace=True,
-    )
+    hist_df.rename(columns=MARKET_COLUMN_MAP, inplace=True)
 
     company_name = await asyncio.to_thread(find.get_company, company)
     metadata = await _collect_ticker_metadata(
         ticker,
-        fallback={
-            "company_id": ticker_symbol,
-            "company_name": company_name or ticker_symbol,
-            "exchange": None,
-            "currency": "USD",
-            "market_cap": None,
-            "shares_outstanding": None,
-            "sector": None,
-            "source": "Yahoo",
-        },
+        fallback=_market_metadata_fallback(ticker_symbol, company_name),
     )
 
     metadata.setdefault("source", "Yahoo")
 
     return hist_df, metadata
+
+
+async def fetch_market_dataframes(
+    companies: list[str],
+    start_date: str,
+    end_date: str,
+) -> Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """
+    여러 종목의 시세를 yf.download 한 번으로 묶어서 가져옵니다.
+    반환값은 {ticker: (raw DataFrame, metadata)} 이며 데이터가 없는 종목은 제외됩니다.
+    """
+
+    ticker_symbols: Dict[str, str] = {}
+    for company in companies:
+        ticker_symbol = await asyncio.to_thread(find.get_ticker, company)
+        ticker_symbols.setdefault(ticker_symbol or company, company)
+
+    if not ticker_symbols:
+        return {}
+
+    downloaded = await asyncio.to_thread(
+        yf.download,
+        list(ticker_symbols),
+        start=start_date,
+        end=end_date,
+        group_by="ticker",
+        auto_adjust=False,
+        threads=True,
+        progress=False,
+    )
+
+    if downloaded is None or downloaded.empty:
+        return {}
+
+    async def _build(ticker_symbol: str, company: str) -> Tuple[str, pd.DataFrame, Dict[str, Any]]:
+        if isinstance(downloaded.columns, pd.MultiIndex):
+            if ticker_symbol not in downloaded.columns.get_level_values(0):
+                return ticker_symbol, pd.DataFrame(), {}
+            hist_df = downloaded[ticker_symbol]
+        else:
+            hist_df = downloaded
+        hist_df = hist_df.dropna(how="all")
+        if hist_df.empty:
+            return ticker_symbol, hist_df, {}
+
+        hist_df = hist_df.reset_index().rename(columns=MARKET_COLUMN_MAP)
+        hist_df.columns.name = None
+
+        ticker = await asyncio.to_thread(yf.Ticker, ticker_symbol)
+        company_name = await asyncio.to_thread(find.get_company, company)
+        metadata = await _collect_ticker_metadata(
+            ticker,
+            fallback=_market_metadata_fallback(ticker_symbol, company_name),
+        )
+        metadata.setdefault("source", "Yahoo")
+        return ticker_symbol, hist_df, metadata
+
+    results = await asyncio.gather(
+        *(_build(ticker_symbol, company) for ticker_symbol, company in ticker_symbols.items())
+    )
+
+    return {
+        ticker_symbol: (hist_df, metadata)
+        for ticker_symbol, hist_df, metadata in results
+        if not hist_df.empty
+    }
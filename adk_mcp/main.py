@@ -1,29 +1,65 @@
+import asyncio
+import importlib
 import logging
 import os
+import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
+# 실행 환경은 시작 시 한 번만 확인
+_IS_PROD = os.environ.get("ENVIRONMENT") == "production"
+
 # .env 파일 로드 (로컬 개발 환경용)
 # 프로덕션 환경에서는 Cloud Run에 설정된 환경변수나 Secret Manager를 사용
-if os.getenv("ENVIRONMENT") != "production":
-    load_dotenv()
+# 상위 디렉터리 탐색(find_dotenv) 없이 main.py 옆의 .env가 있을 때만 로드
+_env_file = Path(__file__).resolve().parent / ".env"
+if not _IS_PROD and _env_file.is_file():
+    load_dotenv(_env_file, override=False)
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from routers import news, market, fundamentals
 from utils.gcpmanager import SecretManager
+from utils.staticcache import InMemoryStaticFiles
 
 # 프로덕션 환경일 경우 Secret Manager에서 환경변수 로드
-if os.getenv("ENVIRONMENT") == "production":
+if _IS_PROD:
     # 로드할 시크릿 목록
     secrets_to_load = ["FRONTEND_URL", "DART_API_KEY", "GEMINI_API_KEY"]
     
     secret_manager = SecretManager()
-    secret_manager.load_secrets_into_env(secrets_to_load)
+    secret_manager.load_secrets_into_env_parallel(secrets_to_load)
+
+_AGENT_MODULE = "stock_agent.fundamentals_agent.agent"
+
+async def _warmup_mcp_servers():
+    # 첫 펀더멘털 요청에서 MCP stdio 서버 기동(인터프리터 + fastmcp import) 지연이 생기지 않도록
+    # 서버 이벤트 루프에서 백그라운드로 미리 연결
+    try:
+        # 에이전트 모듈 import(google-adk 등)는 수 초가 걸리므로 스레드에서 수행하여
+        # 그 동안에도 이벤트 루프가 /health 등 요청을 처리할 수 있게 한다
+        agent_module = await asyncio.to_thread(importlib.import_module, _AGENT_MODULE)
+        await agent_module.warmup_fetcher_tools()
+    except Exception as exc:
+        logging.warning("MCP server warmup skipped: %s", exc)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 이벤트 루프는 태스크를 약한 참조로만 들고 있으므로 참조를 유지
+    warmup_task = asyncio.create_task(_warmup_mcp_servers())
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        # 종료 시 stdio MCP 서버 자식 프로세스가 남지 않도록 툴셋 연결을 정리
+        agent_module = sys.modules.get(_AGENT_MODULE)
+        if agent_module is not None:
+            await agent_module.close_fetcher_tools()
 
-app = FastAPI()
+# dict 응답은 stdlib json 대신 orjson(C 구현)으로 직렬화
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS 설정
 origins = [
@@ -34,21 +70,21 @@ origins = [
 ]
 
 # 프로덕션 환경에서는 Secret Manager에서 로드한 FRONTEND_URL 사용
-if os.getenv("ENVIRONMENT") == "production":
+if _IS_PROD:
     frontend_url = os.getenv("FRONTEND_URL")
     if frontend_url:
         origins.append(frontend_url)
     
-    # Cloud Run 기본 도메인도 추가
-    origins.extend([
-        "https://*.run.app",
-        "https://*.googleusercontent.com",
-        "https://stocks.sayouzone.com"
-    ])
+    origins.append("https://stocks.sayouzone.com")
+
+# CORSMiddleware의 allow_origins는 와일드카드를 지원하지 않고 정확히 일치하는 문자열만 허용하므로
+# Cloud Run 기본 도메인(*.run.app, *.googleusercontent.com)은 정규식으로 허용 (Starlette가 한 번만 컴파일)
+_CORS_ORIGIN_REGEX = r"https://([a-z0-9-]+\.)+(run\.app|googleusercontent\.com)"
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
+    allow_origin_regex=_CORS_ORIGIN_REGEX if _IS_PROD else None,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -65,12 +101,22 @@ app.include_router(fundamentals.router)
 
 _frontend_build = Path(__file__).resolve().parent / "frontend" / "build"
 if _frontend_build.exists() and (_frontend_build / "index.html").exists():
-    
+    # 빌드 산출물은 고정이므로 시작 시 메모리에 올려 두고 서빙 (요청마다 디스크 I/O 없음)
+    _static_files = InMemoryStaticFiles(_frontend_build)
+    _index_asset = _static_files.fallback
+    _index_headers = {
+        "ETag": _index_asset.etag.decode(),
+        "Cache-Control": _index_asset.cache_control.decode(),
+    }
+
+    # SPA 폴백도 메모리에 올려 둔 index.html로 응답 (파일 stat/open 없음)
     @app.exception_handler(404)
     async def not_found_exception_handler(request: Request, exc: HTTPException):
-        return FileResponse(str(_frontend_build / "index.html"))
+        if request.headers.get("if-none-match") == _index_headers["ETag"]:
+            return Response(status_code=304, headers=_index_headers)
+        return Response(content=_index_asset.body, media_type="text/html", headers=_index_headers)
 
-    app.mount("/", StaticFiles(directory=str(_frontend_build)), name="static")
+    app.mount("/", _static_files, name="static")
     
 else:
     logging.warning("Frontend build directory not found at %s; static hosting disabled.", _frontend_build)